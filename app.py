@@ -1,4 +1,5 @@
 from business_layer import *
+from presentation_layer import write_lines
 from datetime import datetime, timedelta
 
 def demonstrate_authentication():
@@ -15,7 +16,7 @@ def demonstrate_authentication():
         auth_service.create_new_user("curator_jane", "secure123", "curator", "admin")
         auth_service.create_new_user("viewer_john", "view1234", "viewer", "admin")
         print("✓ Users created successfully")
-    except Exception as e:
+    except (ValueError, PermissionError) as e:
         print(f"Note: {e}")
 
     # Test 2: Valid login
@@ -32,20 +33,17 @@ def demonstrate_authentication():
 
     # Test 4: Permission check
     print("\n4. Testing role-based access control...")
-    print(f"Admin can create users: {auth_service.check_access('admin', 'admin')}")
-    print(f"Curator can create users: {auth_service.check_access('curator', 'admin')}")
-    print(f"Viewer can view data: {auth_service.check_access('viewer', 'viewer')}")
+    access = auth_service.check_access_bulk([('admin', 'admin'), ('curator', 'admin'), ('viewer', 'viewer')])
+    print(f"Admin can create users: {access[('admin', 'admin')]}")
+    print(f"Curator can create users: {access[('curator', 'admin')]}")
+    print(f"Viewer can view data: {access[('viewer', 'viewer')]}")
 
-def demonstrate_business_logic():
+def demonstrate_business_logic(museum_service, exhibit_service, visitor_service, maintenance_service):
     """Demonstrate business layer functionality"""
     print("\n" + "="*70)
     print("DEMONSTRATING: Business Logic Layer")
     print("="*70)
 
-    museum_service = MuseumService(1)
-    exhibit_service = ExhibitService(1)
-    visitor_service = VisitorService(1)
-
     # Test 1: Museum creation with validation
     print("\n1. Creating museums with business rules...")
     try:
@@ -95,15 +93,12 @@ def demonstrate_business_logic():
     except ValueError as e:
         print(f"✓ Duplicate prevention working: {e}")
 
-def demonstrate_data_integrity():
+def demonstrate_data_integrity(museum_service, exhibit_service, visitor_service, maintenance_service):
     """Demonstrate database constraints and triggers"""
     print("\n" + "="*70)
     print("DEMONSTRATING: Data Integrity Features")
     print("="*70)
 
-    museum_service = MuseumService(1)
-    exhibit_service = ExhibitService(1)
-
     # Test 1: Unique constraint
     print("\n1. Testing unique constraint...")
     try:
@@ -117,7 +112,7 @@ def demonstrate_data_integrity():
         exhibit_service.add_exhibit(
             999, "Invalid Museum Item", "Test", "2020-01-01"
         )
-    except Exception as e:
+    except ValueError:
         print(f"✓ Foreign key constraint enforced: Invalid museum reference")
 
     # Test 3: Check constraint
@@ -137,15 +132,12 @@ def demonstrate_data_integrity():
     except ValueError as e:
         print(f"✓ NOT NULL enforced: {e}")
 
-def demonstrate_performance_optimizations():
+def demonstrate_performance_optimizations(museum_service, exhibit_service, visitor_service, maintenance_service):
     """Demonstrate performance features"""
     print("\n" + "="*70)
     print("DEMONSTRATING: Performance Optimizations")
     print("="*70)
 
-    exhibit_service = ExhibitService(1)
-    visitor_service = VisitorService(1)
-
     # Test 1: Indexed search
     print("\n1. Testing indexed search performance...")
     import time
@@ -166,8 +158,8 @@ def demonstrate_performance_optimizations():
 
     print(f"✓ Aggregation completed in {duration*1000:.2f}ms")
     print(f"  Top 3 exhibits by maintenance:")
-    for i, ex in enumerate(top_exhibits[:3], 1):
-        print(f"  {i}. {ex['item_title']} - {ex['maintenance_count']} actions")
+    write_lines([f"  {i}. {ex['item_title']} - {ex['maintenance_count']} actions"
+                 for i, ex in enumerate(top_exhibits[:3], 1)])
 
     # Test 3: Email lookup with index
     print("\n3. Testing indexed email lookup...")
@@ -179,30 +171,24 @@ def demonstrate_performance_optimizations():
     if visitor:
         print(f"✓ Lookup completed in {duration*1000:.2f}ms (using index)")
 
-def demonstrate_advanced_queries():
+def demonstrate_advanced_queries(museum_service, exhibit_service, visitor_service, maintenance_service):
     """Demonstrate complex analytical queries"""
     print("\n" + "="*70)
     print("DEMONSTRATING: Advanced Queries & Analytics")
     print("="*70)
 
-    museum_service = MuseumService(1)
-    visitor_service = VisitorService(1)
-    maintenance_service = MaintenanceService(1)
-
     # Test 1: Museum performance analysis
     print("\n1. Museum Performance Analysis:")
     museums = museum_service.get_all_museums()
 
-    for museum in museums[:3]:
-        try:
-            perf = museum_service.get_museum_performance(museum['id'])
-            print(f"\n   {perf['museum_name']}:")
-            print(f"   - Exhibits: {perf.get('total_exhibits', 0)}")
-            print(f"   - Visits: {perf.get('total_visits', 0)}")
-            print(f"   - Performance Score: {perf['performance_score']:.1f}/100")
-            print(f"   - Key Recommendation: {perf['recommendations'][0]}")
-        except:
-            pass
+    lines = []
+    for perf in museum_service.get_museum_performance_bulk([m['id'] for m in museums[:3]]).values():
+        lines += [f"\n   {perf['museum_name']}:",
+                  f"   - Exhibits: {perf.get('total_exhibits', 0)}",
+                  f"   - Visits: {perf.get('total_visits', 0)}",
+                  f"   - Performance Score: {perf['performance_score']:.1f}/100",
+                  f"   - Key Recommendation: {perf['recommendations'][0]}"]
+    write_lines(lines)
 
     # Test 2: Visitor analytics
     print("\n2. Visitor Statistics:")
@@ -215,66 +201,54 @@ def demonstrate_advanced_queries():
     # Test 3: VIP identification
     print("\n3. VIP Visitors (5+ visits):")
     vips = visitor_service.identify_vip_visitors(5)
-    for vip in vips[:3]:
-        print(f"   - {vip['guest_name']}: {vip['total_visits']} visits, "
-              f"${vip['total_spent']:.2f} spent")
+    write_lines([f"   - {vip['guest_name']}: {vip['total_visits']} visits, "
+                 f"${vip['total_spent']:.2f} spent" for vip in vips[:3]])
 
     # Test 4: Maintenance plan
     print("\n4. Prioritized Maintenance Plan:")
-    plan = maintenance_service.generate_maintenance_plan(180)
+    plan = maintenance_service.generate_maintenance_plan(180, limit=5)
 
-    for item in plan[:5]:
-        print(f"   - {item['item_title']}")
-        print(f"     Priority: {item['priority_score']:.1f} | "
-              f"Urgency: {item['urgency']} | "
-              f"Days Since: {int(item['days_since']) if item['days_since'] else 'Never'}")
+    lines = []
+    for item in plan:
+        lines += [f"   - {item['item_title']}",
+                  f"     Priority: {item['priority_score']:.1f} | "
+                  f"Urgency: {item['urgency']} | "
+                  f"Days Since: {int(item['days_since']) if item['days_since'] else 'Never'}"]
+    write_lines(lines)
 
-def demonstrate_audit_logging():
+def demonstrate_audit_logging(museum_service, exhibit_service, visitor_service, maintenance_service):
     """Demonstrate audit trail functionality"""
     print("\n" + "="*70)
     print("DEMONSTRATING: Audit Logging & Compliance")
     print("="*70)
 
-    museum_service = MuseumService(1)
-
     # Perform some operations
     print("\n1. Performing audited operations...")
-    try:
+    museum_id = museum_service.repo.find_museum_id("National Gallery", "Edinburgh")
+    if museum_id is None:
         museum_id = museum_service.create_museum(
             "National Gallery", "Edinburgh",
             address="The Mound", phone="+44-131-624-6200"
         )
         print(f"✓ Museum created: ID {museum_id}")
-    except:
-        pass
+    else:
+        print(f"✓ Museum already registered: ID {museum_id}")
 
     # Check audit log
     print("\n2. Reviewing audit log...")
-    audit_records = museum_service.repo.execute_read("""
-        SELECT al.*, u.username
-        FROM audit_log al
-        JOIN users u ON al.user_id = u.user_id
-        ORDER BY al.timestamp DESC
-        LIMIT 5
-    """)
+    audit_records = museum_service.repo.get_recent_audit_entries(5)
 
     print("\n   Recent Audit Entries:")
-    for record in audit_records:
-        print(f"   - {record['timestamp']}: {record['username']} "
-              f"{record['action']} on {record['table_name']} "
-              f"(Record #{record['record_id']})")
+    write_lines([f"   - {record['timestamp']}: {record['username']} "
+                 f"{record['action']} on {record['table_name']} "
+                 f"(Record #{record['record_id']})" for record in audit_records])
 
-def populate_sample_data():
-    """Populate database with comprehensive sample data"""
+def populate_sample_data(museum_service, exhibit_service, visitor_service, maintenance_service):
+    """Populate database with comprehensive sample data (one transaction per section)"""
     print("\n" + "="*70)
     print("POPULATING SAMPLE DATA")
     print("="*70)
 
-    museum_service = MuseumService(1)
-    exhibit_service = ExhibitService(1)
-    visitor_service = VisitorService(1)
-    maintenance_service = MaintenanceService(1)
-
     # Museums
     print("\nAdding museums...")
     museums = [
@@ -283,12 +257,10 @@ def populate_sample_data():
         ("National Museum of Scotland", "Edinburgh", "+44-300-123-6789")
     ]
 
-    for name, city, phone in museums:
-        try:
-            museum_service.create_museum(name, city, phone=phone)
-            print(f"✓ {name}")
-        except:
-            pass
+    _, rejected = museum_service.create_museums_bulk(
+        [{'name': name, 'city': city, 'phone': phone} for name, city, phone in museums]
+    )
+    write_lines([f"✓ {name}" for i, (name, _, _) in enumerate(museums) if i not in rejected])
 
     # Exhibits
     print("\nAdding exhibits...")
@@ -303,17 +275,13 @@ def populate_sample_data():
         (4, "Dolly the Sheep", "Natural History", "1996-07-05", "Good", 500000)
     ]
 
-    exhibit_ids = []
-    for museum_id, title, category, date, condition, value in exhibits:
-        try:
-            eid = exhibit_service.add_exhibit(
-                museum_id, title, category, date,
-                condition=condition, value=value
-            )
-            exhibit_ids.append(eid)
-            print(f"✓ {title}")
-        except Exception as e:
-            print(f"✗ {title}: {e}")
+    exhibit_ids, rejected = exhibit_service.add_exhibits_bulk([
+        {'museum_id': museum_id, 'title': title, 'category': category,
+         'date_acquired': date, 'condition': condition, 'value': value}
+        for museum_id, title, category, date, condition, value in exhibits
+    ])
+    write_lines([f"✗ {title}: {rejected[i]}" if i in rejected else f"✓ {title}"
+                 for i, (_, title, *_) in enumerate(exhibits)])
 
     # Visitors
     print("\nRegistering visitors...")
@@ -327,41 +295,42 @@ def populate_sample_data():
         ("Sophia Patel", "sophia.patel@example.co.uk", "Family")
     ]
 
-    visitor_ids = []
-    for name, email, membership in visitors:
-        try:
-            vid = visitor_service.register_visitor(name, email, membership=membership)
-            visitor_ids.append(vid)
-            print(f"✓ {name}")
-        except:
-            pass
+    visitor_ids, rejected = visitor_service.register_visitors_bulk(
+        [{'name': name, 'email': email, 'membership': membership}
+         for name, email, membership in visitors]
+    )
+    write_lines([f"✓ {name}" for i, (name, _, _) in enumerate(visitors) if i not in rejected])
 
     # Visits
     print("\nLogging visits...")
     import random
-    today = datetime.now()
-
-    for _ in range(20):
-        try:
-            v_id = random.choice(visitor_ids)
-            m_id = random.randint(1, 4)
-            days_ago = random.randint(0, 180)
-            visit_date = (today - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-            rating = random.randint(3, 5)
-
-            # Get visitor membership
-            visitor = visitor_service.repo.execute_read(
-                "SELECT membership_type FROM guest WHERE guest_id = ?", (v_id,)
-            )
-            membership = visitor[0]['membership_type'] if visitor else "None"
-
-            visitor_service.log_visit_with_pricing(
-                v_id, m_id, visit_date, membership, rating
-            )
-        except:
-            pass
-
-    print(f"✓ Logged visits")
+    today = datetime.now().date()
+    # Date strings for the last two years, formatted once and indexed by days ago
+    past_dates = [(today - timedelta(days=d)).isoformat() for d in range(731)]
+
+    visit_count = 20 if visitor_ids else 0
+
+    # One membership lookup for all visitors instead of a query per visit
+    memberships = visitor_service.repo.get_membership_types()
+
+    # Draw every random column up front, then zip them into rows
+    v_ids = random.choices(visitor_ids, k=visit_count)
+    m_ids = random.choices(range(1, 5), k=visit_count)
+    days_ago = random.choices(range(0, 181), k=visit_count)
+    ratings = random.choices(range(3, 6), k=visit_count)
+
+    visits = [
+        {'visitor_id': v_id, 'museum_id': m_id,
+         'visit_date': past_dates[days],
+         'membership_type': memberships.get(v_id, "None"), 'rating': rating}
+        for v_id, m_id, days, rating in zip(v_ids, m_ids, days_ago, ratings)
+    ]
+
+    try:
+        visitor_service.log_visits_bulk(visits)
+        print(f"✓ Logged visits")
+    except (ValueError, RuntimeError) as e:
+        print(f"✗ Visits: {e}")
 
     # Maintenance
     print("\nScheduling maintenance...")
@@ -375,22 +344,30 @@ def populate_sample_data():
         "Dr. Ahmed Hassan", "Ms. Rachel Green"
     ]
 
-    for exhibit_id in exhibit_ids[:5]:
-        for _ in range(random.randint(1, 3)):
-            try:
-                days_ago = random.randint(30, 730)
-                m_date = (today - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-                m_type = random.choice(maintenance_types)
-                specialist = random.choice(specialists)
-                cost = random.uniform(500, 5000)
-
-                maintenance_service.schedule_maintenance(
-                    exhibit_id, m_type, m_date, specialist, cost=cost
-                )
-            except:
-                pass
-
-    print(f"✓ Maintenance scheduled")
+    # 1-3 actions for each of the first five exhibits, drawn column by column
+    action_counts = random.choices(range(1, 4), k=len(exhibit_ids[:5]))
+    item_refs = [eid for eid, count in zip(exhibit_ids[:5], action_counts) for _ in range(count)]
+    record_count = len(item_refs)
+
+    records = [
+        {'item_id': item_id, 'action': m_type,
+         'date': past_dates[days],
+         'specialist': specialist, 'cost': cost}
+        for item_id, m_type, days, specialist, cost in zip(
+            item_refs,
+            random.choices(maintenance_types, k=record_count),
+            random.choices(range(30, 731), k=record_count),
+            random.choices(specialists, k=record_count),
+            [random.uniform(500, 5000) for _ in range(record_count)]
+        )
+    ]
+
+    try:
+        maintenance_service.schedule_maintenance_bulk(records)
+        print(f"✓ Maintenance scheduled")
+    except (ValueError, RuntimeError) as e:
+        print(f"✗ Maintenance: {e}")
+
     print("\n✓ Sample data population complete!")
 
 def main():
@@ -403,17 +380,19 @@ def main():
     # Initialize database
     import database
     database.initialize_database_structure()
+    # One set of services (acting as user 1) shared by every demonstration
+    services = (MuseumService(1), ExhibitService(1), VisitorService(1), MaintenanceService(1))
 
     # Populate data
-    populate_sample_data()
+    populate_sample_data(*services)
 
     # Run demonstrations
     demonstrate_authentication()
-    demonstrate_business_logic()
-    demonstrate_data_integrity()
-    demonstrate_performance_optimizations()
-    demonstrate_advanced_queries()
-    demonstrate_audit_logging()
+    demonstrate_business_logic(*services)
+    demonstrate_data_integrity(*services)
+    demonstrate_performance_optimizations(*services)
+    demonstrate_advanced_queries(*services)
+    demonstrate_audit_logging(*services)
 
     print("\n" + "="*70)
     print("DEMONSTRATION COMPLETE")
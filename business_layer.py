@@ -1,7 +1,90 @@
 from data_access_layer import *
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
+from bisect import bisect_right
+from collections import OrderedDict
 import re
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
+
+# Ticket pricing (business rule): base price and membership discounts
+_BASE_TICKET_PRICE = 15.0
+_DISCOUNT_RATES = MappingProxyType({
+    'None': 0.0,
+    'Basic': 0.10,  # 10% off
+    'Premium': 0.25,  # 25% off
+    'Family': 0.30  # 30% off
+})
+
+# Maintenance cannot be scheduled further ahead than this (business rule)
+_MAINTENANCE_HORIZON = timedelta(days=365)
+
+# Urgency bands for maintenance priority scores: below 40 is LOW, 80 and up CRITICAL
+_URGENCY_THRESHOLDS = (40, 60, 80)
+_URGENCY_LABELS = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_PHONE_ALLOWED_RE = re.compile(r'^[\d\s\-\+\(\)]+$')
+_PHONE_STRIP_RE = re.compile(r'[\s\-\(\)]')
+
+def _parse_iso_date(date_string: str) -> datetime:
+    """Parse a YYYY-MM-DD string (fromisoformat is much cheaper than strptime)"""
+    if not isinstance(date_string, str) or not _DATE_RE.fullmatch(date_string):
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+    try:
+        return datetime.fromisoformat(date_string)
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+
+# Cache-miss sentinel returned by _TTLCache.get (None can be a cached value)
+_MISSING = object()
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries also expire after `ttl` seconds"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, default: Any = _MISSING) -> Any:
+        """Return the cached value, or `default` if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, *keys: Any) -> None:
+        """Drop the given keys (called after writes that affect only those entries)"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def cache_clear(self) -> None:
+        """Drop every entry (called after writes that affect cached reads)"""
+        with self._lock:
+            self._entries.clear()
+
+# Read caches shared by all service instances; writes through the services clear them
+_visitor_email_cache = _TTLCache(maxsize=1024, ttl=60)
+_visitor_membership_cache = _TTLCache(maxsize=1024, ttl=60)
+_visitor_report_cache = _TTLCache(maxsize=16, ttl=60)
+_museum_performance_cache = _TTLCache(maxsize=512, ttl=30)
+_museum_list_cache = _TTLCache(maxsize=1, ttl=30)
 
 class AuthenticationService:
     """Handle authentication and authorization business logic"""
@@ -9,10 +92,10 @@ class AuthenticationService:
     def __init__(self):
         self.auth_dal = AuthenticationDAL()
 
-    def login(self, username: str, password: str) -> Dict[str, Any]:
+    def login(self, username: str, password: str) -> sqlite3.Row:
         """
         Authenticate user
-        Returns: User info dict or raises exception
+        Returns: User info row (user_id, username, role, is_active) or raises exception
         """
         if not username or not password:
             raise ValueError("Username and password are required")
@@ -44,6 +127,11 @@ class AuthenticationService:
         """Check if user has sufficient privileges"""
         return self.auth_dal.check_permission(user_role, required_role)
 
+    def check_access_bulk(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], bool]:
+        """Check several (user_role, required_role) pairs at once"""
+        return {(user_role, required_role): self.auth_dal.check_permission(user_role, required_role)
+                for user_role, required_role in pairs}
+
 class MuseumService:
     """Business logic for museum operations"""
 
@@ -55,49 +143,93 @@ class MuseumService:
         Create museum with business validation
         Returns: Museum ID
         """
-        # Business rule: Museum name must be unique per city
-        existing = self.repo.execute_read(
-            "SELECT id FROM museum WHERE museum_name = ? AND city = ?",
-            (name, city)
-        )
-        if existing:
-            raise ValueError(f"Museum '{name}' already exists in {city}")
-
         # Validate phone number format if provided
         if 'phone' in kwargs and kwargs['phone']:
             if not self._validate_phone(kwargs['phone']):
                 raise ValueError("Invalid phone number format")
 
-        return self.repo.add_museum(name, city, **kwargs)
+        # Business rule: Museum name must be unique per city (enforced by the insert)
+        museum_id = self.repo.add_museum(name, city, **kwargs)
+        _museum_list_cache.cache_clear()
+        return museum_id
 
-    def get_all_museums(self) -> List[Dict[str, Any]]:
-        """Get all museums with enriched data"""
-        museums = self.repo.get_all_museums()
-        return [dict(museum) for museum in museums]
+    def create_museums_bulk(self, museums: List[Dict[str, Any]]) -> Tuple[List[int], Dict[int, str]]:
+        """
+        Create many museums in a single transaction
+        Each row holds create_museum's arguments (name, city, address, phone, opening_hours)
+        Returns: (new museum IDs, {row index: rejection reason})
+        """
+        existing = set(self.repo.execute_read_tuples("SELECT museum_name, city FROM museum"))
+        accepted, rejected = [], {}
+
+        for index, museum in enumerate(museums):
+            name, city = museum.get('name', ""), museum.get('city', "")
+            if not name.strip() or not city.strip():
+                rejected[index] = "Museum name and city cannot be empty"
+            elif (name, city) in existing:
+                rejected[index] = f"Museum '{name}' already exists in {city}"
+            elif museum.get('phone') and not self._validate_phone(museum['phone']):
+                rejected[index] = "Invalid phone number format"
+            else:
+                existing.add((name, city))
+                accepted.append(museum)
+
+        museum_ids = self.repo.add_museums(accepted)
+        _museum_list_cache.cache_clear()
+        return museum_ids, rejected
+
+    def get_all_museums(self) -> List[sqlite3.Row]:
+        """
+        Get all museums with enriched data
+        Cached for 30 seconds and dropped when museums or exhibits are added
+        """
+        museums = _museum_list_cache.get('all')
+        if museums is _MISSING:
+            museums = self.repo.get_all_museums()
+            _museum_list_cache.set('all', museums)
+        # Rows are immutable, so the cached list only needs a shallow copy
+        return list(museums)
 
     def get_museum_performance(self, museum_id: int) -> Dict[str, Any]:
         """
         Analyze museum performance metrics
         Business logic: Calculate KPIs and recommendations
+        Results are cached for 30 seconds and dropped when the museum gains exhibits or visits
         """
-        stats = self.repo.get_museum_stats(museum_id)
-
-        if not stats:
+        performance = self.get_museum_performance_bulk([museum_id]).get(museum_id)
+        if performance is None:
             raise ValueError(f"Museum {museum_id} not found")
+        return performance
 
-        # Business logic: Calculate performance score
-        performance = {
-            **stats,
-            'performance_score': self._calculate_performance_score(stats),
-            'recommendations': self._generate_recommendations(stats)
-        }
+    def get_museum_performance_bulk(self, museum_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Performance metrics for several museums keyed by museum id (in the
+        order given), fetching all uncached ones in a single query.
+        Unknown museum ids are left out.
+        """
+        results = {}
+        for museum_id in museum_ids:
+            cached = _museum_performance_cache.get(museum_id)
+            if cached is not _MISSING:
+                results[museum_id] = cached
+
+        missing = [museum_id for museum_id in museum_ids if museum_id not in results]
+        for museum_id, stats in self.repo.get_museum_stats_bulk(missing).items():
+            # Business logic: Calculate performance score
+            performance = {
+                **stats,
+                'performance_score': self._calculate_performance_score(stats),
+                'recommendations': self._generate_recommendations(stats)
+            }
+            _museum_performance_cache.set(museum_id, performance)
+            results[museum_id] = performance
 
-        return performance
+        return {museum_id: dict(results[museum_id]) for museum_id in museum_ids if museum_id in results}
 
-    def _validate_phone(self, phone: str) -> bool:
+    @staticmethod
+    def _validate_phone(phone: str) -> bool:
         """Validate phone number format"""
-        pattern = r'^[\d\s\-\+\(\)]+$'
-        return bool(re.match(pattern, phone)) and len(re.sub(r'[\s\-\(\)]', '', phone)) >= 10
+        return bool(_PHONE_ALLOWED_RE.match(phone)) and len(_PHONE_STRIP_RE.sub('', phone)) >= 10
 
     def _calculate_performance_score(self, stats: Dict) -> float:
         """Business logic: Calculate museum performance score (0-100)"""
@@ -142,12 +274,13 @@ class ExhibitService:
         self.repo = ExhibitRepository(user_id)
 
     def add_exhibit(self, museum_id: int, title: str, category: str,
-                   date_acquired: str, **kwargs) -> int:
+                   date_acquired: str, *, now: Optional[datetime] = None, **kwargs) -> int:
         """
         Add exhibit with business validation
+        Callers adding many exhibits can pass one `now` for the whole batch
         """
         # Business rule: Acquisition date cannot be in future
-        if self._parse_date(date_acquired) > datetime.now():
+        if _parse_iso_date(date_acquired) > (now or datetime.now()):
             raise ValueError("Acquisition date cannot be in the future")
 
         # Business rule: High-value items require condition assessment
@@ -155,12 +288,49 @@ class ExhibitService:
         if value > 10000 and not kwargs.get('condition'):
             raise ValueError("High-value items (>10000) must have condition specified")
 
-        return self.repo.add_exhibit(museum_id, title, category, date_acquired, **kwargs)
+        exhibit_id = self.repo.add_exhibit(museum_id, title, category, date_acquired, **kwargs)
+        _museum_performance_cache.discard(museum_id)
+        _museum_list_cache.cache_clear()  # Exhibit counts changed
+        return exhibit_id
 
-    def get_exhibits_by_condition(self, condition: str) -> List[Dict[str, Any]]:
+    def add_exhibits_bulk(self, exhibits: List[Dict[str, Any]]) -> Tuple[List[int], Dict[int, str]]:
+        """
+        Add many exhibits in a single transaction
+        Each row holds add_exhibit's arguments (museum_id, title, category, date_acquired, ...)
+        Returns: (new exhibit IDs, {row index: rejection reason})
+        """
+        museum_ids = {museum_id for (museum_id,) in self.repo.execute_read_tuples("SELECT id FROM museum")}
+        now = datetime.now()
+        accepted, rejected = [], {}
+
+        for index, exhibit in enumerate(exhibits):
+            value = exhibit.get('value', 0.0)
+            try:
+                if exhibit['museum_id'] not in museum_ids:
+                    raise ValueError(f"Museum {exhibit['museum_id']} not found")
+                if not exhibit.get('title', "").strip():
+                    raise ValueError("Exhibit title cannot be empty")
+                if _parse_iso_date(exhibit['date_acquired']) > now:
+                    raise ValueError("Acquisition date cannot be in the future")
+                if value < 0:
+                    raise ValueError("Exhibit value cannot be negative")
+                if value > 10000 and not exhibit.get('condition'):
+                    raise ValueError("High-value items (>10000) must have condition specified")
+                if exhibit.get('condition', "Good") not in VALID_CONDITIONS:
+                    raise ValueError(f"Invalid condition. Must be one of: {', '.join(VALID_CONDITIONS)}")
+            except ValueError as e:
+                rejected[index] = str(e)
+            else:
+                accepted.append(exhibit)
+
+        exhibit_ids = self.repo.add_exhibits(accepted)
+        _museum_performance_cache.discard(*{exhibit['museum_id'] for exhibit in accepted})
+        _museum_list_cache.cache_clear()  # Exhibit counts changed
+        return exhibit_ids, rejected
+
+    def get_exhibits_by_condition(self, condition: str) -> List[sqlite3.Row]:
         """Get exhibits filtered by condition"""
-        all_exhibits = self.repo.get_all_exhibits()
-        return [dict(ex) for ex in all_exhibits if ex['condition'] == condition]
+        return self.repo.get_exhibits_by_condition(condition)
 
     def flag_for_restoration(self, exhibit_id: int) -> None:
         """
@@ -169,31 +339,22 @@ class ExhibitService:
         """
         self.repo.update_exhibit_condition(exhibit_id, 'Restoration Required')
 
-    def get_valuable_exhibits(self, min_value: float = 5000) -> List[Dict[str, Any]]:
+    def get_valuable_exhibits(self, min_value: float = 5000) -> List[sqlite3.Row]:
         """Business logic: Get high-value exhibits requiring insurance review"""
-        result = self.repo.execute_read("""
+        return self.repo.execute_read("""
             SELECT mi.*, m.museum_name
             FROM museum_item mi
             JOIN museum m ON mi.museum_ref = m.id
             WHERE mi.value >= ?
             ORDER BY mi.value DESC
         """, (min_value,))
-        return [dict(row) for row in result]
 
-    def search_exhibits(self, search_term: str) -> List[Dict[str, Any]]:
+    def search_exhibits(self, search_term: str) -> List[sqlite3.Row]:
         """Search exhibits with input sanitization"""
         if not search_term or len(search_term.strip()) < 2:
             raise ValueError("Search term must be at least 2 characters")
 
-        results = self.repo.search_exhibits(search_term.strip())
-        return [dict(row) for row in results]
-
-    def _parse_date(self, date_string: str) -> datetime:
-        """Parse date string to datetime"""
-        try:
-            return datetime.strptime(date_string, "%Y-%m-%d")
-        except ValueError:
-            raise ValueError("Invalid date format. Use YYYY-MM-DD")
+        return self.repo.search_exhibits(search_term.strip())
 
 class VisitorService:
     """Business logic for visitor management"""
@@ -210,7 +371,36 @@ class VisitorService:
         if existing:
             raise ValueError(f"Visitor with email {email} already registered")
 
-        return self.repo.register_visitor(name, email, **kwargs)
+        visitor_id = self.repo.register_visitor(name, email, **kwargs)
+        self._invalidate_caches()
+        return visitor_id
+
+    def register_visitors_bulk(self, visitors: List[Dict[str, Any]]) -> Tuple[List[int], Dict[int, str]]:
+        """
+        Register many visitors in a single transaction
+        Each row holds register_visitor's arguments (name, email, phone, membership)
+        Returns: (new visitor IDs, {row index: rejection reason})
+        """
+        known_emails = {email for (email,) in self.repo.execute_read_tuples("SELECT contact_email FROM guest")}
+        accepted, rejected = [], {}
+
+        for index, visitor in enumerate(visitors):
+            name, email = visitor.get('name', ""), visitor.get('email', "")
+            if not email or '@' not in email or '.' not in email:
+                rejected[index] = "Invalid email address format"
+            elif not name.strip():
+                rejected[index] = "Visitor name cannot be empty"
+            elif email.lower() in known_emails:
+                rejected[index] = f"Visitor with email {email} already registered"
+            elif visitor.get('membership', "None") not in VALID_MEMBERSHIPS:
+                rejected[index] = f"Invalid membership. Must be one of: {', '.join(VALID_MEMBERSHIPS)}"
+            else:
+                known_emails.add(email.lower())
+                accepted.append(visitor)
+
+        visitor_ids = self.repo.register_visitors(accepted)
+        self._invalidate_caches()
+        return visitor_ids, rejected
 
     def log_visit_with_pricing(self, visitor_id: int, museum_id: int,
                               visit_date: str, membership_type: str = "None",
@@ -218,80 +408,169 @@ class VisitorService:
         """
         Business logic: Calculate ticket price based on membership
         """
-        # Get base ticket price (business rule)
-        base_price = 15.0
+        ticket_price = self._ticket_price(membership_type)
 
-        # Apply membership discount
-        discount_rates = {
-            'None': 0.0,
-            'Basic': 0.10,  # 10% off
-            'Premium': 0.25,  # 25% off
-            'Family': 0.30  # 30% off
-        }
+        visit_id = self.repo.log_visit(visitor_id, museum_id, visit_date, ticket_price, rating)
+        self._invalidate_caches([museum_id])
+        return visit_id
 
-        discount = discount_rates.get(membership_type, 0.0)
-        ticket_price = base_price * (1 - discount)
+    def log_visits_bulk(self, visits: List[Dict[str, Any]]) -> Tuple[List[int], Dict[int, str]]:
+        """
+        Log many priced visits in a single transaction
+        Each row holds log_visit_with_pricing's arguments
+        (visitor_id, museum_id, visit_date, membership_type, rating)
+        Returns: (new visit IDs, {row index: rejection reason})
+        """
+        visitor_ids = {guest_id for (guest_id,) in self.repo.execute_read_tuples("SELECT guest_id FROM guest")}
+        museum_ids = {museum_id for (museum_id,) in self.repo.execute_read_tuples("SELECT id FROM museum")}
+        today = datetime.now()
+        accepted, rejected = [], {}
+
+        for index, visit in enumerate(visits):
+            rating = visit.get('rating')
+            try:
+                if visit['visitor_id'] not in visitor_ids:
+                    raise ValueError(f"Visitor {visit['visitor_id']} not found")
+                if visit['museum_id'] not in museum_ids:
+                    raise ValueError(f"Museum {visit['museum_id']} not found")
+                if _parse_iso_date(visit['visit_date']) > today:
+                    raise ValueError("Visit date cannot be in the future")
+                if rating is not None and (rating < 1 or rating > 5):
+                    raise ValueError("Rating must be between 1 and 5")
+            except KeyError as e:
+                rejected[index] = f"Missing required field {e}"
+            except ValueError as e:
+                rejected[index] = str(e)
+            else:
+                accepted.append({
+                    'visitor_id': visit['visitor_id'],
+                    'museum_id': visit['museum_id'],
+                    'date': visit['visit_date'],
+                    'ticket_price': self._ticket_price(visit.get('membership_type', "None")),
+                    'rating': rating
+                })
 
-        return self.repo.log_visit(visitor_id, museum_id, visit_date, ticket_price, rating)
+        visit_ids = self.repo.log_visits(accepted)
+        self._invalidate_caches({visit['museum_id'] for visit in accepted})
+        return visit_ids, rejected
+
+    def _ticket_price(self, membership_type: str) -> float:
+        """Business logic: Calculate ticket price based on membership"""
+        discount = _DISCOUNT_RATES.get(membership_type, 0.0)
+        return _BASE_TICKET_PRICE * (1 - discount) if discount else _BASE_TICKET_PRICE
+
+    def _invalidate_caches(self, museum_ids=()) -> None:
+        """Drop cached visitor reads, and the visited museums' performance, after a write"""
+        _visitor_email_cache.cache_clear()
+        _visitor_membership_cache.cache_clear()
+        _visitor_report_cache.cache_clear()
+        _museum_performance_cache.discard(*museum_ids)
+
+    def _cached_visitor_read(self, key: Tuple, load):
+        """Serve a visitor aggregate from the short-lived cache, loading it on a miss"""
+        value = _visitor_report_cache.get(key)
+        if value is _MISSING:
+            value = load()
+            _visitor_report_cache.set(key, value)
+        return value
 
     def get_visitor_statistics(self) -> Dict[str, Any]:
         """
         Business analytics: Calculate visitor metrics
         """
-        activity = self.repo.visitor_activity()
-
-        if not activity:
-            return {
-                'total_visitors': 0,
-                'total_visits': 0,
-                'avg_visits_per_visitor': 0,
-                'total_revenue': 0
-            }
-
-        total_visitors = len(activity)
-        total_visits = sum(v['total_visits'] for v in activity)
-        total_revenue = sum(v['total_spent'] or 0 for v in activity)
+        totals, top_visitors = self._cached_visitor_read(
+            ('statistics',),
+            lambda: (self.repo.visitor_totals(), [dict(v) for v in self.repo.top_visitors(5)])
+        )
+        total_visitors = totals['total_visitors']
 
         return {
             'total_visitors': total_visitors,
-            'total_visits': total_visits,
-            'avg_visits_per_visitor': round(total_visits / total_visitors, 2),
-            'total_revenue': round(total_revenue, 2),
-            'top_visitors': [dict(v) for v in activity[:5]]
+            'total_visits': totals['total_visits'],
+            'avg_visits_per_visitor': (round(totals['total_visits'] / total_visitors, 2)
+                                       if total_visitors else 0),
+            'total_revenue': round(totals['total_revenue'], 2),
+            'top_visitors': [dict(v) for v in top_visitors]
         }
 
-    def identify_vip_visitors(self, min_visits: int = 5) -> List[Dict[str, Any]]:
+    def identify_vip_visitors(self, min_visits: int = 5) -> List[sqlite3.Row]:
         """
         Business logic: Identify VIP visitors for special offers
         """
-        activity = self.repo.visitor_activity()
-        vip_visitors = [dict(v) for v in activity if v['total_visits'] >= min_visits]
-        return sorted(vip_visitors, key=lambda x: x['total_visits'], reverse=True)
+        # Rows are immutable, so the cached list only needs a shallow copy
+        return list(self._cached_visitor_read(
+            ('vip', min_visits),
+            lambda: self.repo.vip_visitors(min_visits)
+        ))
 
     def get_visitor_by_email(self, email: str) -> Optional[Dict[str, Any]]:
-        """Business wrapper: look up a visitor by e-mail address."""
-        result = self.repo.get_visitor_by_email(email)
-        return dict(result) if result else None
+        """Business wrapper: look up a visitor by e-mail address (cached)."""
+        key = email.lower()
+        visitor = _visitor_email_cache.get(key)
+        if visitor is _MISSING:
+            result = self.repo.get_visitor_by_email(key)
+            visitor = dict(result) if result else None
+            _visitor_email_cache.set(key, visitor)
+        return dict(visitor) if visitor else None
+
+    def get_membership_type(self, visitor_id: int) -> str:
+        """Business wrapper: a visitor's membership type for pricing (cached)."""
+        membership = _visitor_membership_cache.get(visitor_id)
+        if membership is _MISSING:
+            membership = self.repo.get_membership_type(visitor_id)
+            _visitor_membership_cache.set(visitor_id, membership)
+        return membership
 
 class MaintenanceService:
     """Business logic for maintenance management"""
 
     def __init__(self, user_id: Optional[int] = None):
         self.repo = MaintenanceRepository(user_id)
-        self.exhibit_repo = ExhibitRepository(user_id)
 
     def schedule_maintenance(self, item_id: int, action: str, date: str,
-                           specialist: str, **kwargs) -> int:
+                           specialist: str, *, now: Optional[datetime] = None, **kwargs) -> int:
         """
         Schedule maintenance with validation
+        Callers scheduling many actions can pass one `now` for the whole batch
         """
         # Business rule: Maintenance cannot be scheduled more than 1 year in advance
-        maintenance_date = datetime.strptime(date, "%Y-%m-%d")
-        if maintenance_date > datetime.now() + timedelta(days=365):
+        maintenance_date = _parse_iso_date(date)
+        if maintenance_date > (now or datetime.now()) + _MAINTENANCE_HORIZON:
             raise ValueError("Cannot schedule maintenance more than 1 year in advance")
 
         return self.repo.add_maintenance(item_id, action, date, specialist, **kwargs)
 
+    def schedule_maintenance_bulk(self, records: List[Dict[str, Any]]) -> Tuple[List[int], Dict[int, str]]:
+        """
+        Schedule many maintenance actions in a single transaction
+        Each row holds schedule_maintenance's arguments (item_id, action, date, specialist, cost, notes)
+        Returns: (new maintenance IDs, {row index: rejection reason})
+        """
+        item_ids = {item_id for (item_id,) in self.repo.execute_read_tuples("SELECT item_id FROM museum_item")}
+        horizon = datetime.now() + _MAINTENANCE_HORIZON
+        accepted, rejected = [], {}
+
+        for index, record in enumerate(records):
+            try:
+                if record['item_id'] not in item_ids:
+                    raise ValueError(f"Exhibit {record['item_id']} not found")
+                if not record.get('action', "").strip():
+                    raise ValueError("Maintenance type cannot be empty")
+                if not record.get('specialist', "").strip():
+                    raise ValueError("Specialist name cannot be empty")
+                if record.get('cost', 0.0) < 0:
+                    raise ValueError("Maintenance cost cannot be negative")
+                if _parse_iso_date(record['date']) > horizon:
+                    raise ValueError("Cannot schedule maintenance more than 1 year in advance")
+            except KeyError as e:
+                rejected[index] = f"Missing required field {e}"
+            except ValueError as e:
+                rejected[index] = str(e)
+            else:
+                accepted.append(record)
+
+        return self.repo.add_maintenance_many(accepted), rejected
+
     def get_maintenance_budget(self, start_date: str, end_date: str) -> Dict[str, Any]:
         """
         Business analytics: Calculate maintenance costs and budget
@@ -306,62 +585,23 @@ class MaintenanceService:
             'total_maintenance_actions': len(records),
             'total_cost': round(total_cost, 2),
             'avg_cost_per_action': round(avg_cost, 2),
-            'records': [dict(r) for r in records]
+            'records': records
         }
 
-    def generate_maintenance_plan(self, days_threshold: int = 365) -> List[Dict[str, Any]]:
+    def generate_maintenance_plan(self, days_threshold: int = 365,
+                                  limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Business logic: Generate prioritized maintenance plan
+        Items arrive scored and ordered by priority from the repository
         """
-        overdue = self.repo.get_overdue_maintenance(days_threshold)
-
-        # Prioritize by condition and days since last maintenance
-        plan = []
-        for item in overdue:
-            # Get current condition
-            exhibit = self.exhibit_repo.execute_read(
-                "SELECT condition, value FROM museum_item WHERE item_id = ?",
-                (item['item_id'],)
-            )
-
-            if exhibit:
-                condition = exhibit[0]['condition']
-                value = exhibit[0]['value'] or 0
-
-                # Calculate priority (higher = more urgent)
-                priority_score = 0
-                if condition == 'Poor' or condition == 'Restoration Required':
-                    priority_score += 50
-                elif condition == 'Fair':
-                    priority_score += 30
-
-                # High value items get priority
-                if value > 10000:
-                    priority_score += 30
-                elif value > 5000:
-                    priority_score += 20
-
-                # Add time factor
-                days_since = item['days_since'] or 999
-                priority_score += min(20, days_since / 50)
-
-                plan.append({
-                    **dict(item),
-                    'condition': condition,
-                    'value': value,
-                    'priority_score': round(priority_score, 2),
-                    'urgency': self._get_urgency_level(priority_score)
-                })
+        overdue = self.repo.get_overdue_maintenance(days_threshold, -1 if limit is None else limit)
 
-        return sorted(plan, key=lambda x: x['priority_score'], reverse=True)
+        return [{
+            **dict(item),
+            'priority_score': round(item['priority_score'], 2),
+            'urgency': self._get_urgency_level(item['priority_score'])
+        } for item in overdue]
 
     def _get_urgency_level(self, priority_score: float) -> str:
         """Business logic: Convert priority score to urgency level"""
-        if priority_score >= 80:
-            return "CRITICAL"
-        elif priority_score >= 60:
-            return "HIGH"
-        elif priority_score >= 40:
-            return "MEDIUM"
-        else:
-            return "LOW"
\ No newline at end of file
+        return _URGENCY_LABELS[bisect_right(_URGENCY_THRESHOLDS, priority_score)]
\ No newline at end of file
@@ -15,7 +15,6 @@ def clear_database_contents():
     connection = None
     try:
         connection = sqlite3.connect(DATABASE_LOCATION)
-        executor = connection.cursor()
 
         # Remove data in correct foreign key order
         tables_to_clear = [
@@ -26,23 +25,21 @@ def clear_database_contents():
             "museum"
         ]
 
-        for table in tables_to_clear:
-            executor.execute(f"DELETE FROM {table}")
-
-        # Reset sequence counters only if sqlite_sequence exists
-        # First check if the table exists
-        executor.execute("""
-            SELECT name FROM sqlite_master
-            WHERE type='table' AND name='sqlite_sequence'
-        """)
-
-        if executor.fetchone():
-            executor.execute("DELETE FROM sqlite_sequence")
-            print("Auto-increment counters reset.")
-        else:
-            print("No auto-increment tables detected.")
-
-        connection.commit()
+        # One script, one transaction: every table is cleared and its
+        # auto-increment counter reset (all of them use AUTOINCREMENT, so
+        # sqlite_sequence always exists) with a single commit. Cached
+        # aggregates and their change counters go too, so no cache entry
+        # can outlive the data it was computed from
+        cleared_names = ", ".join(f"'{table}'" for table in tables_to_clear)
+        connection.executescript(
+            "BEGIN IMMEDIATE;\n"
+            + "".join(f"DELETE FROM {table};\n" for table in tables_to_clear)
+            + f"DELETE FROM sqlite_sequence WHERE name IN ({cleared_names});\n"
+            + "DELETE FROM query_cache;\n"
+            + "DELETE FROM table_version;\n"
+            + "COMMIT;"
+        )
+        print("Auto-increment counters reset.")
         print("Database reset completed successfully.")
 
     except sqlite3.Error as db_error:
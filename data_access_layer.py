@@ -1,80 +1,278 @@
 import sqlite3
+import atexit
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 import hashlib
-from typing import Optional, List, Tuple, Any
-from datetime import datetime
+import json
+from typing import Optional, List, Tuple, Any, Iterable, Iterator
+from functools import lru_cache
 
 DB_PATH = Path.cwd() / "museum_data.db"
 
-class DatabaseConnection:
-    """Centralized DB connection handler with connection pooling"""
+VALID_CONDITIONS = ['Excellent', 'Good', 'Fair', 'Poor', 'Restoration Required']
+VALID_MEMBERSHIPS = ['None', 'Basic', 'Premium', 'Family']
+ROLE_LEVELS = {'viewer': 1, 'curator': 2, 'admin': 3}
+
+# Hot statements kept as module constants so every call passes the identical
+# SQL text and hits the connection's prepared-statement cache
+_SQL_AUTHENTICATE = """UPDATE users SET last_login = CURRENT_TIMESTAMP
+                       WHERE username = ? AND password_hash = ? AND is_active = 1
+                       RETURNING user_id, username, role, is_active"""
+_SQL_INSERT_AUDIT = """INSERT INTO audit_log (user_id, table_name, action, record_id, details)
+                       VALUES (?, ?, ?, ?, ?)"""
+_SQL_RECENT_AUDIT = """
+    SELECT al.timestamp, al.action, al.table_name, al.record_id, u.username
+    FROM audit_log al
+    JOIN users u ON al.user_id = u.user_id
+    ORDER BY al.timestamp DESC
+    LIMIT ?
+"""
+_SQL_ALL_EXHIBITS = """
+    SELECT mi.*, m.museum_name, m.city
+    FROM museum_item mi
+    JOIN museum m ON mi.museum_ref = m.id
+    ORDER BY mi.item_title
+"""
+_SQL_EXHIBITS_PAGE = _SQL_ALL_EXHIBITS + "LIMIT ? OFFSET ?"
+_SQL_COUNT_EXHIBITS = "SELECT COUNT(*) FROM museum_item mi JOIN museum m ON mi.museum_ref = m.id"
+_SQL_VISITOR_BY_EMAIL = "SELECT * FROM guest WHERE contact_email = ?"
+_SQL_GUEST_MEMBERSHIP = "SELECT membership_type FROM guest WHERE guest_id = ?"
+_SQL_ALL_MEMBERSHIPS = "SELECT guest_id, membership_type FROM guest"
+_SQL_VISITOR_RANKING = """
+    SELECT
+        g.guest_name,
+        g.contact_email,
+        g.membership_type,
+        COUNT(gv.visit_id) AS total_visits,
+        MAX(gv.visit_date) as last_visit,
+        AVG(gv.rating) as avg_rating,
+        SUM(gv.ticket_price) as total_spent
+    FROM guest g
+    JOIN guest_visit gv ON g.guest_id = gv.guest_ref
+    GROUP BY g.guest_id
+    HAVING total_visits >= ?
+    ORDER BY total_visits DESC
+    LIMIT ?
+"""
+
+@lru_cache(maxsize=256)
+def _role_allows(user_role: str, required_role: str) -> bool:
+    """Whether `user_role` sits at or above `required_role` in the role ladder"""
+    return ROLE_LEVELS.get(user_role, 0) >= ROLE_LEVELS.get(required_role, 0)
+
+def _change_token(table: str, key: str) -> str:
+    """
+    SQL expression that changes whenever `table` gains, loses or updates rows;
+    table_version counts every change, so a wipe and refill can't repeat a token
+    """
+    return (f"(SELECT COUNT(*) || ':' || IFNULL(MAX({key}), 0) FROM {table}) || ':' || "
+            f"IFNULL((SELECT version FROM table_version WHERE table_name = '{table}'), 0)")
+
+_MUSEUM_TOKEN = _change_token("museum", "id")
+_ITEM_TOKEN = _change_token("museum_item", "item_id")
+_MAINTENANCE_TOKEN = _change_token("item_maintenance", "maintenance_id")
+_GUEST_TOKEN = _change_token("guest", "guest_id")
+_VISIT_TOKEN = _change_token("guest_visit", "visit_id")
 
-    @staticmethod
-    def connect():
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        conn.execute("PRAGMA foreign_keys = ON")  # Ensure FK constraints
+class DatabaseConnection:
+    """Centralized DB connection handler keeping one open connection per thread"""
+
+    _local = threading.local()
+    _opened: List[sqlite3.Connection] = []  # Every thread's connection, for shutdown
+    _opened_lock = threading.Lock()
+
+    @classmethod
+    def connect(cls) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use"""
+        conn = getattr(cls._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row  # Enable column access by name
+            conn.execute("PRAGMA foreign_keys = ON")  # Ensure FK constraints
+            # WAL is set persistently by database.py; NORMAL is only durable enough under WAL
+            if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+                conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA temp_store = MEMORY")  # Sorts and temp B-trees stay off disk
+            conn.execute("PRAGMA cache_size = -65536")  # 64 MiB page cache
+            conn.execute("PRAGMA mmap_size = 268435456")  # Memory-map up to 256 MiB of the file
+            cls._local.conn = conn
+            with cls._opened_lock:
+                cls._opened.append(conn)
         return conn
 
+    @classmethod
+    @contextmanager
+    def acquire(cls) -> Iterator[sqlite3.Connection]:
+        """Lend the calling thread's connection for one transaction, committing on success"""
+        conn = cls.connect()
+        with conn:  # Commits on normal exit, rolls back if the block raises
+            yield conn
+
+    @classmethod
+    def close(cls):
+        """Close every thread's connection (each is reopened lazily on next use)"""
+        with cls._opened_lock:
+            for conn in cls._opened:
+                conn.close()
+            cls._opened.clear()
+        cls._local = threading.local()
+
+atexit.register(DatabaseConnection.close)
+
 class MuseumDAL:
     """Base Data Access Layer with security and audit logging"""
 
     def __init__(self, user_id: Optional[int] = None):
         self.user_id = user_id
 
-    def execute_write(self, query: str, params: tuple = ()) -> int:
-        """Execute write operation with proper error handling"""
-        with DatabaseConnection.connect() as conn:
+    def execute_write(self, query: str, params: tuple = (),
+                      audit: Optional[Tuple[str, str, Optional[int], str]] = None) -> int:
+        """
+        Execute write operation with proper error handling
+        `audit` is (table_name, action, record_id, details), with a record_id of
+        None meaning the inserted row; it is written in the same transaction
+        """
+        with DatabaseConnection.acquire() as conn:
             try:
                 cursor = conn.execute(query, params)
-                conn.commit()
+                if audit:
+                    table_name, action, record_id, details = audit
+                    record_id = cursor.lastrowid if record_id is None else record_id
+                    self._insert_audit(conn, table_name, action, [(record_id, details)])
                 return cursor.lastrowid
             except sqlite3.IntegrityError as e:
                 raise ValueError(f"Data integrity violation: {str(e)}")
             except sqlite3.Error as e:
                 raise RuntimeError(f"Database error: {str(e)}")
 
+    def execute_write_many(self, query: str, params_seq: List[tuple],
+                           audit: Optional[Tuple[str, str, List[str]]] = None) -> List[int]:
+        """
+        Execute a batched INSERT in a single transaction and return the new row ids
+        `audit` is (table_name, action, details per row); those entries are
+        written in the same transaction, so they commit or roll back with the rows
+        """
+        if not params_seq:
+            return []
+        with DatabaseConnection.acquire() as conn:
+            try:
+                cursor = conn.executemany(query, params_seq)
+                # Rows inserted inside one write transaction receive consecutive ids
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                row_ids = list(range(last_id - cursor.rowcount + 1, last_id + 1))
+                if audit:
+                    table_name, action, details = audit
+                    self._insert_audit(conn, table_name, action, zip(row_ids, details))
+                return row_ids
+            except sqlite3.IntegrityError as e:
+                raise ValueError(f"Data integrity violation: {str(e)}")
+            except sqlite3.Error as e:
+                raise RuntimeError(f"Database error: {str(e)}")
+
+    def execute_write_returning(self, query: str, params: tuple = (),
+                                audit: Optional[Tuple[str, str, str]] = None) -> List[sqlite3.Row]:
+        """
+        Execute a write with a RETURNING clause and return the affected rows
+        `audit` is (table_name, action, details), logged in the same transaction
+        against the first returned column of each row
+        """
+        with DatabaseConnection.acquire() as conn:
+            try:
+                rows = conn.execute(query, params).fetchall()
+                if audit and rows:
+                    table_name, action, details = audit
+                    self._insert_audit(conn, table_name, action, [(row[0], details) for row in rows])
+                return rows
+            except sqlite3.IntegrityError as e:
+                raise ValueError(f"Data integrity violation: {str(e)}")
+            except sqlite3.Error as e:
+                raise RuntimeError(f"Database error: {str(e)}")
+
     def execute_read(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
         """Execute read operation and return results"""
-        with DatabaseConnection.connect() as conn:
-            return conn.execute(query, params).fetchall()
+        return DatabaseConnection.connect().execute(query, params).fetchall()
+
+    def iter_read(self, query: str, params: tuple = ()) -> Iterator[sqlite3.Row]:
+        """Stream read results from the cursor instead of materialising them"""
+        cursor = DatabaseConnection.connect().execute(query, params)
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+
+    def iter_read_dicts(self, query: str, params: tuple = ()) -> Iterator[dict]:
+        """Stream rows as plain dicts, built from tuples without per-row Row objects"""
+        cursor = DatabaseConnection.connect().cursor()
+        cursor.row_factory = None
+        try:
+            cursor.execute(query, params)
+            columns = [column[0] for column in cursor.description]
+            for row in cursor:
+                yield dict(zip(columns, row))
+        finally:
+            cursor.close()
+
+    def execute_read_tuples(self, query: str, params: tuple = ()) -> List[tuple]:
+        """Execute read operation returning plain tuples (no per-row Row objects)"""
+        cursor = DatabaseConnection.connect().cursor()
+        cursor.row_factory = None
+        return cursor.execute(query, params).fetchall()
+
+    def cached_query(self, name: str, token_sql: str, body_sql: str) -> List[dict]:
+        """
+        Serve an aggregate from the persistent query_cache table while the
+        change token computed by `token_sql` is unchanged; recompute and
+        store the JSON-serialised rows on a miss
+        """
+        token = self.execute_read(token_sql)[0][0]
+        hit = self.execute_read(
+            "SELECT payload FROM query_cache WHERE name = ? AND token = ?",
+            (name, token)
+        )
+        if hit:
+            return json.loads(hit[0]['payload'])
+
+        rows = list(self.iter_read_dicts(body_sql))
+        self.execute_write(
+            "INSERT OR REPLACE INTO query_cache (name, token, payload) VALUES (?, ?, ?)",
+            (name, token, json.dumps(rows))
+        )
+        return rows
 
     def log_audit(self, table_name: str, action: str, record_id: int, details: str = ""):
-        """Log changes to audit table for compliance"""
+        """Log a change that has no write of its own to the audit table"""
         if self.user_id:
-            self.execute_write(
-                """INSERT INTO audit_log (user_id, table_name, action, record_id, details)
-                   VALUES (?, ?, ?, ?, ?)""",
-                (self.user_id, table_name, action, record_id, details)
-            )
+            with DatabaseConnection.acquire() as conn:
+                self._insert_audit(conn, table_name, action, [(record_id, details)])
+
+    def _insert_audit(self, conn: sqlite3.Connection, table_name: str, action: str,
+                      entries: Iterable[Tuple[int, str]]):
+        """Write (record_id, details) audit entries on `conn`, inside the caller's transaction"""
+        if self.user_id:
+            conn.executemany(_SQL_INSERT_AUDIT,
+                             [(self.user_id, table_name, action, record_id, details)
+                              for record_id, details in entries])
+
+    def get_recent_audit_entries(self, limit: int = 5) -> List[sqlite3.Row]:
+        """Most recent audit entries with the acting username"""
+        return self.execute_read(_SQL_RECENT_AUDIT, (limit,))
+
 
 class AuthenticationDAL(MuseumDAL):
     """Handle user authentication and authorization"""
 
     @staticmethod
-    def hash_password(password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+    def hash_password(password: str) -> bytes:
+        """Hash password using SHA-256 (raw digest, stored as a BLOB)"""
+        return hashlib.sha256(password.encode()).digest()
 
-    def authenticate_user(self, username: str, password: str) -> Optional[dict]:
+    def authenticate_user(self, username: str, password: str) -> Optional[sqlite3.Row]:
         """Authenticate user and return user info if valid"""
         password_hash = self.hash_password(password)
-        result = self.execute_read(
-            """SELECT user_id, username, role, is_active
-               FROM users
-               WHERE username = ? AND password_hash = ? AND is_active = 1""",
-            (username, password_hash)
-        )
-
-        if result:
-            user = dict(result[0])
-            # Update last login
-            self.execute_write(
-                "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE user_id = ?",
-                (user['user_id'],)
-            )
-            return user
-        return None
+        # Verify credentials and stamp last login in a single statement
+        result = self.execute_write_returning(_SQL_AUTHENTICATE, (username, password_hash))
+        return result[0] if result else None
 
     def create_user(self, username: str, password: str, role: str) -> int:
         """Create new user (admin only)"""
@@ -82,17 +280,15 @@ class AuthenticationDAL(MuseumDAL):
             raise ValueError("Invalid role. Must be admin, curator, or viewer")
 
         password_hash = self.hash_password(password)
-        user_id = self.execute_write(
+        return self.execute_write(
             "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-            (username, password_hash, role)
+            (username, password_hash, role),
+            audit=("users", "INSERT", None, f"Created user: {username}")
         )
-        self.log_audit("users", "INSERT", user_id, f"Created user: {username}")
-        return user_id
 
     def check_permission(self, user_role: str, required_role: str) -> bool:
         """Check if user has required permission level"""
-        role_hierarchy = {'viewer': 1, 'curator': 2, 'admin': 3}
-        return role_hierarchy.get(user_role, 0) >= role_hierarchy.get(required_role, 0)
+        return _role_allows(user_role, required_role)
 
 class MuseumRepository(MuseumDAL):
     """Repository for museum operations with validation"""
@@ -105,13 +301,37 @@ class MuseumRepository(MuseumDAL):
         if not city or len(city.strip()) == 0:
             raise ValueError("City cannot be empty")
 
-        museum_id = self.execute_write(
+        # The UNIQUE(museum_name, city) conflict doubles as the duplicate check
+        inserted = self.execute_write_returning(
+            """INSERT INTO museum (museum_name, city, address, phone, opening_hours)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(museum_name, city) DO NOTHING
+               RETURNING id""",
+            (name.strip(), city.strip(), address, phone, opening_hours),
+            audit=("museum", "INSERT", f"Added museum: {name}")
+        )
+        if not inserted:
+            raise ValueError(f"Museum '{name}' already exists in {city}")
+
+        return inserted[0]['id']
+
+    def find_museum_id(self, name: str, city: str) -> Optional[int]:
+        """ID of the museum with this name in this city, if registered"""
+        result = self.execute_read(
+            "SELECT id FROM museum WHERE museum_name = ? AND city = ?",
+            (name, city)
+        )
+        return result[0]['id'] if result else None
+
+    def add_museums(self, museums: List[dict]) -> List[int]:
+        """Bulk-insert pre-validated museums in one transaction"""
+        return self.execute_write_many(
             """INSERT INTO museum (museum_name, city, address, phone, opening_hours)
                VALUES (?, ?, ?, ?, ?)""",
-            (name.strip(), city.strip(), address, phone, opening_hours)
+            [(m['name'].strip(), m['city'].strip(), m.get('address', ""),
+              m.get('phone', ""), m.get('opening_hours', "")) for m in museums],
+            audit=("museum", "INSERT", [f"Added museum: {m['name']}" for m in museums])
         )
-        self.log_audit("museum", "INSERT", museum_id, f"Added museum: {name}")
-        return museum_id
 
     def get_all_museums(self) -> List[sqlite3.Row]:
         """Retrieve all museums with exhibit count"""
@@ -127,26 +347,46 @@ class MuseumRepository(MuseumDAL):
         """Update museum details"""
         self.execute_write(
             "UPDATE museum SET museum_name = ?, city = ? WHERE id = ?",
-            (name, city, museum_id)
+            (name, city, museum_id),
+            audit=("museum", "UPDATE", museum_id, f"Updated museum: {name}")
         )
-        self.log_audit("museum", "UPDATE", museum_id, f"Updated museum: {name}")
 
     def get_museum_stats(self, museum_id: int) -> dict:
         """Get comprehensive statistics for a museum"""
-        stats = self.execute_read("""
+        return self.get_museum_stats_bulk([museum_id]).get(museum_id, {})
+
+    def get_museum_stats_bulk(self, museum_ids: List[int]) -> dict:
+        """Statistics for several museums in one query, keyed by museum id"""
+        if not museum_ids:
+            return {}
+        placeholders = ", ".join("?" * len(museum_ids))
+        # Aggregate exhibits and visits separately so one doesn't multiply the other
+        rows = self.execute_read(f"""
+            WITH ex AS (
+                SELECT museum_ref, COUNT(*) AS total_exhibits
+                FROM museum_item
+                WHERE museum_ref IN ({placeholders})
+                GROUP BY museum_ref
+            ), vi AS (
+                SELECT museum_ref, COUNT(*) AS total_visits,
+                       AVG(rating) AS avg_rating, SUM(ticket_price) AS total_revenue
+                FROM guest_visit
+                WHERE museum_ref IN ({placeholders})
+                GROUP BY museum_ref
+            )
             SELECT
+                m.id,
                 m.museum_name,
-                COUNT(DISTINCT mi.item_id) as total_exhibits,
-                COUNT(DISTINCT gv.visit_id) as total_visits,
-                AVG(gv.rating) as avg_rating,
-                SUM(gv.ticket_price) as total_revenue
+                IFNULL(ex.total_exhibits, 0) as total_exhibits,
+                IFNULL(vi.total_visits, 0) as total_visits,
+                vi.avg_rating,
+                vi.total_revenue
             FROM museum m
-            LEFT JOIN museum_item mi ON m.id = mi.museum_ref
-            LEFT JOIN guest_visit gv ON m.id = gv.museum_ref
-            WHERE m.id = ?
-            GROUP BY m.id
-        """, (museum_id,))
-        return dict(stats[0]) if stats else {}
+            LEFT JOIN ex ON ex.museum_ref = m.id
+            LEFT JOIN vi ON vi.museum_ref = m.id
+            WHERE m.id IN ({placeholders})
+        """, tuple(museum_ids) * 3)
+        return {row['id']: {key: row[key] for key in row.keys() if key != 'id'} for row in rows}
 
 class ExhibitRepository(MuseumDAL):
     """Repository for exhibit operations with business logic"""
@@ -160,63 +400,106 @@ class ExhibitRepository(MuseumDAL):
         if value < 0:
             raise ValueError("Exhibit value cannot be negative")
 
-        exhibit_id = self.execute_write(
+        return self.execute_write(
+            """INSERT INTO museum_item
+               (museum_ref, item_title, item_type, date_acquired, description, condition, value)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (museum_id, title.strip(), category, date, description, condition, value),
+            audit=("museum_item", "INSERT", None, f"Added exhibit: {title}")
+        )
+
+    def add_exhibits(self, exhibits: List[dict]) -> List[int]:
+        """Bulk-insert pre-validated exhibits in one transaction"""
+        return self.execute_write_many(
             """INSERT INTO museum_item
                (museum_ref, item_title, item_type, date_acquired, description, condition, value)
                VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (museum_id, title.strip(), category, date, description, condition, value)
+            [(e['museum_id'], e['title'].strip(), e['category'], e['date_acquired'],
+              e.get('description', ""), e.get('condition', "Good"), e.get('value', 0.0))
+             for e in exhibits],
+            audit=("museum_item", "INSERT", [f"Added exhibit: {e['title']}" for e in exhibits])
         )
-        self.log_audit("museum_item", "INSERT", exhibit_id, f"Added exhibit: {title}")
-        return exhibit_id
 
     def get_all_exhibits(self) -> List[sqlite3.Row]:
         """Get all exhibits with museum information"""
+        return self.execute_read(_SQL_ALL_EXHIBITS)
+
+    def iter_all_exhibits(self) -> Iterator[sqlite3.Row]:
+        """Stream all exhibits with museum information, one row at a time"""
+        return self.iter_read(_SQL_ALL_EXHIBITS)
+
+    def get_exhibits_page(self, limit: int, offset: int = 0) -> List[sqlite3.Row]:
+        """One page of get_all_exhibits, limited in SQL"""
+        return self.execute_read(_SQL_EXHIBITS_PAGE, (limit, offset))
+
+    def count_exhibits(self) -> int:
+        """Number of rows get_all_exhibits would return"""
+        return self.execute_read_tuples(_SQL_COUNT_EXHIBITS)[0][0]
+
+    def get_exhibits_by_condition(self, condition: str) -> List[sqlite3.Row]:
+        """Get exhibits in one condition with museum information"""
         return self.execute_read("""
             SELECT mi.*, m.museum_name, m.city
             FROM museum_item mi
             JOIN museum m ON mi.museum_ref = m.id
+            WHERE mi.condition = ?
             ORDER BY mi.item_title
-        """)
+        """, (condition,))
 
     def update_exhibit_condition(self, exhibit_id: int, condition: str) -> None:
         """Update exhibit condition"""
-        valid_conditions = ['Excellent', 'Good', 'Fair', 'Poor', 'Restoration Required']
-        if condition not in valid_conditions:
-            raise ValueError(f"Invalid condition. Must be one of: {', '.join(valid_conditions)}")
+        if condition not in VALID_CONDITIONS:
+            raise ValueError(f"Invalid condition. Must be one of: {', '.join(VALID_CONDITIONS)}")
 
         self.execute_write(
             "UPDATE museum_item SET condition = ? WHERE item_id = ?",
-            (condition, exhibit_id)
+            (condition, exhibit_id),
+            audit=("museum_item", "UPDATE", exhibit_id, f"Updated condition to: {condition}")
         )
-        self.log_audit("museum_item", "UPDATE", exhibit_id, f"Updated condition to: {condition}")
 
-    def top_exhibits(self) -> List[sqlite3.Row]:
-        """Get exhibits ranked by maintenance frequency (performance optimized)"""
-        return self.execute_read("""
-            SELECT
-                mi.item_title,
-                mi.item_type,
-                m.museum_name,
-                COUNT(im.maintenance_id) AS maintenance_count,
-                MAX(im.maintenance_date) as last_maintenance
-            FROM museum_item mi
-            LEFT JOIN item_maintenance im ON mi.item_id = im.item_ref
-            JOIN museum m ON mi.museum_ref = m.id
-            GROUP BY mi.item_id
-            ORDER BY maintenance_count DESC, last_maintenance DESC
-            LIMIT 10
-        """)
+    def top_exhibits(self) -> List[dict]:
+        """Get exhibits ranked by maintenance frequency (cached until the tables change)"""
+        return self.cached_query(
+            "top_exhibits",
+            f"SELECT {_ITEM_TOKEN} || '|' || {_MAINTENANCE_TOKEN} || '|' || {_MUSEUM_TOKEN}",
+            """
+                WITH per_item AS (
+                    -- Aggregated straight off idx_maintenance_item_date_cost, before any join
+                    SELECT item_ref, COUNT(*) AS maintenance_count,
+                           MAX(maintenance_date) AS last_maintenance
+                    FROM item_maintenance
+                    GROUP BY item_ref
+                )
+                SELECT
+                    mi.item_title,
+                    mi.item_type,
+                    m.museum_name,
+                    IFNULL(pi.maintenance_count, 0) AS maintenance_count,
+                    pi.last_maintenance
+                FROM museum_item mi
+                JOIN museum m ON mi.museum_ref = m.id
+                LEFT JOIN per_item pi ON pi.item_ref = mi.item_id
+                ORDER BY maintenance_count DESC, pi.last_maintenance DESC
+                LIMIT 10
+            """
+        )
 
     def search_exhibits(self, search_term: str) -> List[sqlite3.Row]:
-        """Search exhibits by title or type"""
-        search_pattern = f"%{search_term}%"
+        """Search exhibits by title, type or description (FTS5 index, ranked)"""
         return self.execute_read("""
             SELECT mi.*, m.museum_name
-            FROM museum_item mi
+            FROM museum_item_fts f
+            JOIN museum_item mi ON mi.item_id = f.rowid
             JOIN museum m ON mi.museum_ref = m.id
-            WHERE mi.item_title LIKE ? OR mi.item_type LIKE ?
-            ORDER BY mi.item_title
-        """, (search_pattern, search_pattern))
+            WHERE museum_item_fts MATCH ?
+            ORDER BY f.rank
+        """, (self._fts_query(search_term),))
+
+    @staticmethod
+    def _fts_query(search_term: str) -> str:
+        """Quote each word as an FTS5 prefix term so user input is never parsed as syntax"""
+        words = search_term.split()
+        return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
 
 class VisitorRepository(MuseumDAL):
     """Repository for visitor operations"""
@@ -229,31 +512,62 @@ class VisitorRepository(MuseumDAL):
         if not name or len(name.strip()) == 0:
             raise ValueError("Visitor name cannot be empty")
 
-        visitor_id = self.execute_write(
+        return self.execute_write(
             """INSERT INTO guest (guest_name, contact_email, phone, membership_type)
                VALUES (?, ?, ?, ?)""",
-            (name.strip(), email.lower(), phone, membership)
+            (name.strip(), email.lower(), phone, membership),
+            audit=("guest", "INSERT", None, f"Registered visitor: {name}")
         )
-        self.log_audit("guest", "INSERT", visitor_id, f"Registered visitor: {name}")
-        return visitor_id
 
-    def visitor_activity(self) -> List[sqlite3.Row]:
-        """Get visitor activity summary with performance optimization"""
-        return self.execute_read("""
+    def register_visitors(self, visitors: List[dict]) -> List[int]:
+        """Bulk-insert pre-validated visitors in one transaction"""
+        return self.execute_write_many(
+            """INSERT INTO guest (guest_name, contact_email, phone, membership_type)
+               VALUES (?, ?, ?, ?)""",
+            [(v['name'].strip(), v['email'].lower(), v.get('phone', ""),
+              v.get('membership', "None")) for v in visitors],
+            audit=("guest", "INSERT", [f"Registered visitor: {v['name']}" for v in visitors])
+        )
+
+    def visitor_activity(self) -> List[dict]:
+        """Get visitor activity summary (cached until guests or visits change)"""
+        return self.cached_query(
+            "visitor_activity",
+            f"SELECT {_GUEST_TOKEN} || '|' || {_VISIT_TOKEN}",
+            """
+                SELECT
+                    g.guest_name,
+                    g.contact_email,
+                    g.membership_type,
+                    COUNT(gv.visit_id) AS total_visits,
+                    MAX(gv.visit_date) as last_visit,
+                    AVG(gv.rating) as avg_rating,
+                    SUM(gv.ticket_price) as total_spent
+                FROM guest g
+                LEFT JOIN guest_visit gv ON g.guest_id = gv.guest_ref
+                GROUP BY g.guest_id
+                HAVING total_visits > 0
+                ORDER BY total_visits DESC
+            """
+        )
+
+    def visitor_totals(self) -> dict:
+        """Visitor, visit and revenue totals in a single aggregate row"""
+        return dict(self.execute_read("""
             SELECT
-                g.guest_name,
-                g.contact_email,
-                g.membership_type,
-                COUNT(gv.visit_id) AS total_visits,
-                MAX(gv.visit_date) as last_visit,
-                AVG(gv.rating) as avg_rating,
-                SUM(gv.ticket_price) as total_spent
-            FROM guest g
-            LEFT JOIN guest_visit gv ON g.guest_id = gv.guest_ref
-            GROUP BY g.guest_id
-            HAVING total_visits > 0
-            ORDER BY total_visits DESC
-        """)
+                COUNT(DISTINCT guest_ref) AS total_visitors,
+                COUNT(*) AS total_visits,
+                IFNULL(SUM(ticket_price), 0) AS total_revenue
+            FROM guest_visit
+        """)[0])
+
+    def top_visitors(self, limit: int = 5) -> List[sqlite3.Row]:
+        """Most frequent visitors, ranked by visit count"""
+        return self.execute_read(_SQL_VISITOR_RANKING, (1, limit))
+
+    def vip_visitors(self, min_visits: int) -> List[sqlite3.Row]:
+        """Every visitor with at least `min_visits` visits, ranked by visit count"""
+        return self.execute_read(_SQL_VISITOR_RANKING, (min_visits, -1))
 
     def log_visit(self, visitor_id: int, museum_id: int, date: str,
                   ticket_price: float = 0.0, rating: Optional[int] = None) -> int:
@@ -263,23 +577,40 @@ class VisitorRepository(MuseumDAL):
         if ticket_price < 0:
             raise ValueError("Ticket price cannot be negative")
 
-        visit_id = self.execute_write(
+        return self.execute_write(
+            """INSERT INTO guest_visit
+               (guest_ref, museum_ref, visit_date, ticket_price, rating)
+               VALUES (?, ?, ?, ?, ?)""",
+            (visitor_id, museum_id, date, ticket_price, rating),
+            audit=("guest_visit", "INSERT", None, f"Logged visit for visitor {visitor_id}")
+        )
+
+    def log_visits(self, visits: List[dict]) -> List[int]:
+        """Bulk-insert pre-validated visits in one transaction"""
+        return self.execute_write_many(
             """INSERT INTO guest_visit
                (guest_ref, museum_ref, visit_date, ticket_price, rating)
                VALUES (?, ?, ?, ?, ?)""",
-            (visitor_id, museum_id, date, ticket_price, rating)
+            [(v['visitor_id'], v['museum_id'], v['date'], v.get('ticket_price', 0.0),
+              v.get('rating')) for v in visits],
+            audit=("guest_visit", "INSERT",
+                   [f"Logged visit for visitor {v['visitor_id']}" for v in visits])
         )
-        self.log_audit("guest_visit", "INSERT", visit_id, f"Logged visit for visitor {visitor_id}")
-        return visit_id
 
     def get_visitor_by_email(self, email: str) -> Optional[sqlite3.Row]:
         """Find visitor by email (performance optimized with index)"""
-        result = self.execute_read(
-            "SELECT * FROM guest WHERE contact_email = ?",
-            (email.lower(),)
-        )
+        result = self.execute_read(_SQL_VISITOR_BY_EMAIL, (email.lower(),))
         return result[0] if result else None
 
+    def get_membership_type(self, visitor_id: int) -> str:
+        """Membership tier of one visitor ("None" if unknown)"""
+        result = self.execute_read(_SQL_GUEST_MEMBERSHIP, (visitor_id,))
+        return result[0]['membership_type'] if result else "None"
+
+    def get_membership_types(self) -> dict:
+        """Membership tier of every visitor, keyed by visitor id"""
+        return dict(self.execute_read_tuples(_SQL_ALL_MEMBERSHIPS))
+
 class MaintenanceRepository(MuseumDAL):
     """Repository for maintenance operations"""
 
@@ -293,32 +624,46 @@ class MaintenanceRepository(MuseumDAL):
         if cost < 0:
             raise ValueError("Maintenance cost cannot be negative")
 
-        maintenance_id = self.execute_write(
+        return self.execute_write(
             """INSERT INTO item_maintenance
                (item_ref, maintenance_type, maintenance_date, specialist_name, cost, notes)
                VALUES (?, ?, ?, ?, ?, ?)""",
-            (item_id, action.strip(), date, specialist.strip(), cost, notes)
+            (item_id, action.strip(), date, specialist.strip(), cost, notes),
+            audit=("item_maintenance", "INSERT", None, f"Added maintenance for item {item_id}")
         )
-        self.log_audit("item_maintenance", "INSERT", maintenance_id,
-                      f"Added maintenance for item {item_id}")
-        return maintenance_id
 
-    def maintenance_summary(self) -> List[sqlite3.Row]:
-        """Get maintenance summary with cost analysis"""
-        return self.execute_read("""
-            SELECT
-                mi.item_title,
-                m.museum_name,
-                COUNT(im.maintenance_id) AS total_actions,
-                SUM(im.cost) as total_cost,
-                MAX(im.maintenance_date) as last_maintenance,
-                MIN(im.maintenance_date) as first_maintenance
-            FROM museum_item mi
-            JOIN item_maintenance im ON mi.item_id = im.item_ref
-            JOIN museum m ON mi.museum_ref = m.id
-            GROUP BY mi.item_id
-            ORDER BY total_actions DESC
-        """)
+    def add_maintenance_many(self, records: List[dict]) -> List[int]:
+        """Bulk-insert pre-validated maintenance records in one transaction"""
+        return self.execute_write_many(
+            """INSERT INTO item_maintenance
+               (item_ref, maintenance_type, maintenance_date, specialist_name, cost, notes)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(r['item_id'], r['action'].strip(), r['date'], r['specialist'].strip(),
+              r.get('cost', 0.0), r.get('notes', "")) for r in records],
+            audit=("item_maintenance", "INSERT",
+                   [f"Added maintenance for item {r['item_id']}" for r in records])
+        )
+
+    def maintenance_summary(self) -> List[dict]:
+        """Get maintenance summary with cost analysis (cached until the tables change)"""
+        return self.cached_query(
+            "maintenance_summary",
+            f"SELECT {_ITEM_TOKEN} || '|' || {_MAINTENANCE_TOKEN} || '|' || {_MUSEUM_TOKEN}",
+            """
+                SELECT
+                    mi.item_title,
+                    m.museum_name,
+                    COUNT(im.maintenance_id) AS total_actions,
+                    SUM(im.cost) as total_cost,
+                    MAX(im.maintenance_date) as last_maintenance,
+                    MIN(im.maintenance_date) as first_maintenance
+                FROM museum_item mi
+                JOIN item_maintenance im ON mi.item_id = im.item_ref
+                JOIN museum m ON mi.museum_ref = m.id
+                GROUP BY mi.item_id
+                ORDER BY total_actions DESC
+            """
+        )
 
     def get_maintenance_by_date_range(self, start_date: str, end_date: str) -> List[sqlite3.Row]:
         """Get maintenance records within date range (performance optimized)"""
@@ -331,20 +676,40 @@ class MaintenanceRepository(MuseumDAL):
             ORDER BY im.maintenance_date DESC
         """, (start_date, end_date))
 
-    def get_overdue_maintenance(self, days: int = 365) -> List[sqlite3.Row]:
-        """Identify exhibits needing maintenance (business logic)"""
+    def get_overdue_maintenance(self, days: int = 365, limit: int = -1) -> List[sqlite3.Row]:
+        """
+        Identify exhibits needing maintenance (business logic), most urgent first.
+        priority_score: condition (Poor/Restoration 50, Fair 30) + value
+        (>10000 30, >5000 20) + days since last maintenance / 50, capped at 20
+        """
         return self.execute_read("""
+            WITH latest AS (
+                SELECT
+                    mi.item_id,
+                    mi.item_title,
+                    m.museum_name,
+                    mi.condition,
+                    IFNULL(mi.value, 0) as value,
+                    -- One probe of idx_maintenance_item_date_cost per item instead of
+                    -- joining and grouping every maintenance row
+                    (SELECT MAX(im.maintenance_date) FROM item_maintenance im
+                     WHERE im.item_ref = mi.item_id) as last_maintenance
+                FROM museum_item mi
+                JOIN museum m ON mi.museum_ref = m.id
+            ),
+            overdue AS (
+                SELECT *, julianday('now') - julianday(last_maintenance) as days_since
+                FROM latest
+            )
             SELECT
-                mi.item_id,
-                mi.item_title,
-                m.museum_name,
-                MAX(im.maintenance_date) as last_maintenance,
-                julianday('now') - julianday(MAX(im.maintenance_date)) as days_since
-            FROM museum_item mi
-            LEFT JOIN item_maintenance im ON mi.item_id = im.item_ref
-            JOIN museum m ON mi.museum_ref = m.id
-            GROUP BY mi.item_id
-            HAVING days_since > ? OR days_since IS NULL
-            ORDER BY days_since DESC
-        """, (days,))
+                *,
+                CASE WHEN condition IN ('Poor', 'Restoration Required') THEN 50
+                     WHEN condition = 'Fair' THEN 30 ELSE 0 END
+                + CASE WHEN value > 10000 THEN 30 WHEN value > 5000 THEN 20 ELSE 0 END
+                + MIN(20, IFNULL(NULLIF(days_since, 0), 999) / 50.0) as priority_score
+            FROM overdue
+            WHERE days_since > ? OR days_since IS NULL
+            ORDER BY priority_score DESC, days_since DESC
+            LIMIT ?
+        """, (days, limit))
 
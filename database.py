@@ -4,12 +4,25 @@ import hashlib
 
 DATABASE_PATH = Path.cwd() / "museum_data.db"
 
+def _rebuild_table(connection, table_name, table_sql):
+    """Recreate a table from its current definition, keeping its rows"""
+    connection.executescript(f"""
+        BEGIN;
+        CREATE TEMP TABLE rebuild_rows AS SELECT * FROM {table_name};
+        DROP TABLE {table_name};
+        {table_sql}
+        INSERT INTO {table_name} SELECT * FROM rebuild_rows;
+        DROP TABLE rebuild_rows;
+        COMMIT;
+    """)
+
 def initialize_database_structure():
     """
     Establishes database connection and creates necessary tables with:
     - Proper constraints for data integrity
     - Triggers for audit logging
     - Indexes for performance optimization
+    - Full-text search index for exhibits
     - User authentication tables
     """
     database_connection = sqlite3.connect(str(DATABASE_PATH))
@@ -18,13 +31,16 @@ def initialize_database_structure():
     # Enable foreign key constraints
     db_cursor.execute("PRAGMA foreign_keys = ON;")
 
+    # Write-ahead logging: persistent per database file, cheaper commits
+    db_cursor.execute("PRAGMA journal_mode = WAL;").fetchone()  # Step it to completion
+
     table_definitions = [
         # User authentication table with role-based access
         """
         CREATE TABLE IF NOT EXISTS users (
             user_id INTEGER PRIMARY KEY AUTOINCREMENT,
             username TEXT NOT NULL UNIQUE,
-            password_hash TEXT NOT NULL,
+            password_hash BLOB NOT NULL,  -- raw 32-byte SHA-256 digest
             role TEXT NOT NULL CHECK(role IN ('admin', 'curator', 'viewer')),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             last_login TIMESTAMP,
@@ -46,6 +62,24 @@ def initialize_database_structure():
         );
         """,
 
+        # Persistent cache for expensive aggregate queries, keyed by a change token
+        """
+        CREATE TABLE IF NOT EXISTS query_cache (
+            name TEXT PRIMARY KEY,
+            token TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        """,
+
+        # Per-table change counters (bumped by triggers) used in cache change tokens
+        """
+        CREATE TABLE IF NOT EXISTS table_version (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+        """,
+
         # Enhanced museum table with constraints
         """
         CREATE TABLE IF NOT EXISTS museum (
@@ -68,7 +102,7 @@ def initialize_database_structure():
             museum_ref INTEGER NOT NULL,
             item_title TEXT NOT NULL CHECK(length(item_title) > 0),
             item_type TEXT CHECK(length(item_type) > 0),
-            date_acquired DATE NOT NULL,
+            date_acquired DATE NOT NULL CHECK(date(date_acquired) IS NOT NULL),
             description TEXT,
             condition TEXT CHECK(condition IN ('Excellent', 'Good', 'Fair', 'Poor', 'Restoration Required')),
             value REAL CHECK(value >= 0),
@@ -85,7 +119,7 @@ def initialize_database_structure():
             maintenance_id INTEGER PRIMARY KEY AUTOINCREMENT,
             item_ref INTEGER NOT NULL,
             maintenance_type TEXT NOT NULL CHECK(length(maintenance_type) > 0),
-            maintenance_date DATE NOT NULL CHECK(maintenance_date <= date('now')),
+            maintenance_date DATE NOT NULL CHECK(date(maintenance_date) IS NOT NULL),
             specialist_name TEXT NOT NULL,
             cost REAL CHECK(cost >= 0),
             notes TEXT,
@@ -112,7 +146,7 @@ def initialize_database_structure():
             visit_id INTEGER PRIMARY KEY AUTOINCREMENT,
             guest_ref INTEGER NOT NULL,
             museum_ref INTEGER NOT NULL,
-            visit_date DATE NOT NULL CHECK(visit_date <= date('now')),
+            visit_date DATE NOT NULL CHECK(date(visit_date) IS NOT NULL),
             ticket_price REAL CHECK(ticket_price >= 0),
             rating INTEGER CHECK(rating BETWEEN 1 AND 5),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -122,25 +156,47 @@ def initialize_database_structure():
         """
     ]
 
-    for table_sql in table_definitions:
-        db_cursor.execute(table_sql)
+    # DDL runs as scripts inside one transaction each: one parse loop and one commit
+    database_connection.executescript("BEGIN;\n" + "\n".join(table_definitions) + "\nCOMMIT;")
+
+    # Tables created with the old `<= date('now')` CHECKs reject every insert
+    # (SQLite forbids non-deterministic functions in CHECK), so rebuild them
+    for table_name in ("item_maintenance", "guest_visit"):
+        stored_sql = db_cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+        ).fetchone()[0]
+        if "date('now')" in stored_sql:
+            table_sql = next(sql for sql in table_definitions
+                             if f"CREATE TABLE IF NOT EXISTS {table_name} " in sql)
+            _rebuild_table(database_connection, table_name, table_sql)
+
+    # Indexes superseded by the composite ones below, or duplicating the
+    # automatic indexes behind the UNIQUE(contact_email) / UNIQUE(username) constraints
+    schema_cleanup = [
+        f"DROP INDEX IF EXISTS {superseded_index};"
+        for superseded_index in ("idx_maintenance_item", "idx_maintenance_item_date", "idx_visit_guest",
+                                 "idx_visit_museum", "idx_audit_timestamp", "idx_guest_email",
+                                 "idx_users_username", "idx_maintenance_date", "idx_visit_date")
+    ]
 
     # Create performance indexes
     indexes = [
         "CREATE INDEX IF NOT EXISTS idx_museum_item_museum ON museum_item(museum_ref);",
-        "CREATE INDEX IF NOT EXISTS idx_maintenance_item ON item_maintenance(item_ref);",
-        "CREATE INDEX IF NOT EXISTS idx_maintenance_date ON item_maintenance(maintenance_date);",
-        "CREATE INDEX IF NOT EXISTS idx_visit_guest ON guest_visit(guest_ref);",
-        "CREATE INDEX IF NOT EXISTS idx_visit_museum ON guest_visit(museum_ref);",
-        "CREATE INDEX IF NOT EXISTS idx_visit_date ON guest_visit(visit_date);",
-        "CREATE INDEX IF NOT EXISTS idx_guest_email ON guest(contact_email);",
-        "CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_log(timestamp);",
-        "CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);"
+        "CREATE INDEX IF NOT EXISTS idx_museum_item_condition ON museum_item(condition);",
+        # High-value lookups (value >= ? ORDER BY value DESC) and title-ordered listings
+        "CREATE INDEX IF NOT EXISTS idx_museum_item_value ON museum_item(value DESC);",
+        "CREATE INDEX IF NOT EXISTS idx_museum_item_title ON museum_item(item_title);",
+        # Date-ordered and covering, so the history/timeline reports stream without a sort
+        "CREATE INDEX IF NOT EXISTS idx_maint_date_item ON item_maintenance(maintenance_date DESC, item_ref, maintenance_type, specialist_name);",
+        "CREATE INDEX IF NOT EXISTS idx_visit_date_refs ON guest_visit(visit_date, guest_ref, museum_ref);",
+        # Composite indexes covering the per-item / per-guest / per-museum aggregates
+        "CREATE INDEX IF NOT EXISTS idx_maintenance_item_date_cost ON item_maintenance(item_ref, maintenance_date DESC, cost);",
+        "CREATE INDEX IF NOT EXISTS idx_visit_guest_date ON guest_visit(guest_ref, visit_date, rating, ticket_price);",
+        "CREATE INDEX IF NOT EXISTS idx_visit_museum_date ON guest_visit(museum_ref, visit_date, rating, ticket_price);",
+        # Covers the recent-audit review so ORDER BY ... LIMIT reads the index in order
+        "CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_log(timestamp DESC, user_id, action, table_name, record_id);"
     ]
 
-    for index_sql in indexes:
-        db_cursor.execute(index_sql)
-
     # Create triggers for automatic timestamp updates
     triggers = [
         """
@@ -166,28 +222,123 @@ def initialize_database_structure():
             SELECT RAISE(ABORT, 'Cannot delete item with maintenance history. Archive instead.');
         END;
         """,
-        # Trigger to validate visit dates are not in future
+    ]
+
+    # Date limits relative to today live in triggers: date('now') is not allowed in CHECK
+    schema_cleanup.append("DROP TRIGGER IF EXISTS validate_visit_date;")
+    date_limits = [
+        ("museum_item", "date_acquired", "date('now')", "Acquisition date cannot be in the future"),
+        ("item_maintenance", "maintenance_date", "date('now', '+1 year')",
+         "Cannot schedule maintenance more than 1 year in advance"),
+        ("guest_visit", "visit_date", "date('now')", "Visit date cannot be in the future"),
+    ]
+    for table, column, limit, message in date_limits:
+        for event in ("insert", "update"):
+            triggers.append(f"""
+        CREATE TRIGGER IF NOT EXISTS validate_{column}_{event}
+        BEFORE {'INSERT' if event == 'insert' else f'UPDATE OF {column}'} ON {table}
+        WHEN NEW.{column} > {limit}
+        BEGIN
+            SELECT RAISE(ABORT, '{message}');
+        END;
+        """)
+
+    # Count every insert, update and delete so cached aggregates notice any change,
+    # including a wipe and refill that ends with the same row counts and ids
+    versioned_tables = ("museum", "museum_item", "item_maintenance", "guest", "guest_visit")
+    counts_all_changes = db_cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'bump_museum_version_on_delete'"
+    ).fetchone()
+    if not counts_all_changes:
+        # Entries cached under the old update-only tokens can't be trusted
+        schema_cleanup.append("DELETE FROM query_cache;")
+    for versioned_table in versioned_tables:
+        for event, suffix in (("UPDATE", ""), ("INSERT", "_on_insert"), ("DELETE", "_on_delete")):
+            triggers.append(f"""
+        CREATE TRIGGER IF NOT EXISTS bump_{versioned_table}_version{suffix}
+        AFTER {event} ON {versioned_table}
+        BEGIN
+            INSERT INTO table_version (table_name, version) VALUES ('{versioned_table}', 1)
+            ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+        END;
+        """)
+
+    # Full-text search index over exhibit text (external-content FTS5 table)
+    fts_exists = db_cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'museum_item_fts'"
+    ).fetchone()
+
+    full_text_search = [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS museum_item_fts USING fts5(
+            item_title, item_type, description,
+            content='museum_item', content_rowid='item_id',
+            tokenize='porter unicode61'
+        );
+        """,
+        # Keep the FTS index in step with museum_item
         """
-        CREATE TRIGGER IF NOT EXISTS validate_visit_date
-        BEFORE INSERT ON guest_visit
-        WHEN NEW.visit_date > date('now')
+        CREATE TRIGGER IF NOT EXISTS museum_item_fts_insert
+        AFTER INSERT ON museum_item
         BEGIN
-            SELECT RAISE(ABORT, 'Visit date cannot be in the future');
+            INSERT INTO museum_item_fts(rowid, item_title, item_type, description)
+            VALUES (NEW.item_id, NEW.item_title, NEW.item_type, NEW.description);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS museum_item_fts_delete
+        AFTER DELETE ON museum_item
+        BEGIN
+            INSERT INTO museum_item_fts(museum_item_fts, rowid, item_title, item_type, description)
+            VALUES ('delete', OLD.item_id, OLD.item_title, OLD.item_type, OLD.description);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS museum_item_fts_update
+        AFTER UPDATE OF item_title, item_type, description ON museum_item
+        BEGIN
+            INSERT INTO museum_item_fts(museum_item_fts, rowid, item_title, item_type, description)
+            VALUES ('delete', OLD.item_id, OLD.item_title, OLD.item_type, OLD.description);
+            INSERT INTO museum_item_fts(rowid, item_title, item_type, description)
+            VALUES (NEW.item_id, NEW.item_title, NEW.item_type, NEW.description);
         END;
         """
     ]
 
-    for trigger_sql in triggers:
-        db_cursor.execute(trigger_sql)
+    # Backfill the index once for databases created before it existed
+    if not fts_exists:
+        full_text_search.append("INSERT INTO museum_item_fts(museum_item_fts) VALUES ('rebuild');")
+
+    database_connection.executescript(
+        "BEGIN;\n" + "\n".join(schema_cleanup + indexes + triggers + full_text_search) + "\nCOMMIT;"
+    )
 
     # Create default admin user if not exists
-    default_admin_password = hashlib.sha256("admin123".encode()).hexdigest()
+    default_admin_password = hashlib.sha256("admin123".encode()).digest()
     db_cursor.execute("""
         INSERT OR IGNORE INTO users (username, password_hash, role)
         VALUES (?, ?, ?)
     """, ("admin", default_admin_password, "admin"))
 
+    # Older databases stored hex digests as text; convert them to the raw bytes
+    # (a BLOB keeps its type even in a column declared TEXT, so no rebuild is needed).
+    # Only well-formed SHA-256 hex digests are touched; any other text is left as it is
+    hex_hashes = db_cursor.execute("""
+        SELECT user_id, password_hash FROM users
+        WHERE typeof(password_hash) = 'text'
+          AND length(password_hash) = 64
+          AND lower(password_hash) NOT GLOB '*[^0-9a-f]*'
+    """).fetchall()
+    db_cursor.executemany(
+        "UPDATE users SET password_hash = ? WHERE user_id = ?",
+        [(bytes.fromhex(password_hash), user_id) for user_id, password_hash in hex_hashes]
+    )
+
     database_connection.commit()
+
+    # Refresh planner statistics so the composite indexes are chosen
+    db_cursor.execute("ANALYZE;")
+
     database_connection.close()
     print("Enhanced museum database ready with security and integrity features.")
     return True
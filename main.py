@@ -1,33 +1,179 @@
 import sqlite3
+import sys
+from contextlib import contextmanager
 
 DATABASE_FILE = "museum_data.db"
 
-class MuseumDB:
-    """Database interaction handler for museum operations"""
+# Rows per multi-row VALUES list (bulk INSERT/UPDATE); 64 rows x 4 columns stays far below
+# SQLite's bound-parameter limit
+INSERT_CHUNK_ROWS = 64
+
+SQL_LIST_EXHIBITS = "SELECT item_id, museum_ref, item_title, item_type, date_acquired FROM museum_item"
+SQL_EXHIBITS_WITH_MUSEUM = """
+    SELECT mi.item_title, mi.item_type, m.museum_name
+    FROM museum_item mi
+    INNER JOIN museum m ON mi.museum_ref = m.id
+"""
+SQL_MAINTENANCE_HISTORY = """
+    SELECT mi.item_title, im.maintenance_type, im.maintenance_date, im.specialist_name
+    FROM item_maintenance im
+    JOIN museum_item mi ON im.item_ref = mi.item_id
+    ORDER BY im.maintenance_date DESC
+"""
+SQL_EXHIBITS_PER_MUSEUM = """
+    SELECT m.museum_name, COUNT(mi.item_id) AS exhibit_count
+    FROM museum m
+    LEFT OUTER JOIN museum_item mi ON m.id = mi.museum_ref
+    GROUP BY m.id
+"""
+SQL_VISITS_PER_MUSEUM = """
+    SELECT m.museum_name, COUNT(gv.visit_id) AS visitor_count
+    FROM guest_visit gv
+    INNER JOIN museum m ON gv.museum_ref = m.id
+    GROUP BY m.id
+"""
+# CROSS JOIN keeps guest_visit outermost so rows stream in idx_visit_date_refs order (no sort)
+SQL_VISITOR_TIMELINE = """
+    SELECT g.guest_name, m.museum_name, gv.visit_date
+    FROM guest_visit gv
+    CROSS JOIN guest g ON gv.guest_ref = g.guest_id
+    CROSS JOIN museum m ON gv.museum_ref = m.id
+    ORDER BY gv.visit_date
+"""
+
+# (heading, query) pairs shown by the dashboard, in display order
+DASHBOARD_REPORTS = (
+    ("Exhibits with Museum Details", SQL_EXHIBITS_WITH_MUSEUM),
+    ("Maintenance History (Recent First)", SQL_MAINTENANCE_HISTORY),
+    ("Exhibit Distribution", SQL_EXHIBITS_PER_MUSEUM),
+    ("Museum Popularity", SQL_VISITS_PER_MUSEUM),
+    ("Visitor Timeline", SQL_VISITOR_TIMELINE),
+)
 
-    def __init__(self):
-        self.db_file = DATABASE_FILE
+class MuseumDB:
+    """
+    Database interaction handler for museum operations
+    Listings return the columns this class writes, in a fixed order, as
+    sqlite3.Row records indexable by column name or position
+    """
+
+    def __init__(self, db_file=DATABASE_FILE):
+        self.db_file = db_file
+        self._conn = None
+
+    @classmethod
+    def in_memory_copy(cls, db_file=DATABASE_FILE):
+        """MuseumDB over an in-memory copy of `db_file`; its writes never reach the file"""
+        db = cls(":memory:")
+        source = sqlite3.connect(db_file)
+        try:
+            source.backup(db._connect())
+        finally:
+            source.close()
+        return db
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _connect(self):
-        """Create database connection"""
-        return sqlite3.connect(self.db_file)
-
-    def _execute_write(self, query, params=None):
+        """Return the shared database connection, opening it on first use"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_file)
+            self._configure(self._conn)
+        return self._conn
+
+    @staticmethod
+    def _configure(conn):
+        """Apply connection settings once, when the connection is opened"""
+        conn.row_factory = sqlite3.Row  # Columns readable by name as well as position
+        journal_mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        if journal_mode == "wal":
+            conn.execute("PRAGMA synchronous = NORMAL")  # Only durable enough under WAL
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -64000")  # ~64 MB page cache
+        conn.execute("PRAGMA mmap_size = 268435456")
+
+    def close(self):
+        """Close the shared connection (reopened on next use)"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes into one transaction, committed (one sync) when the block
+        exits and rolled back if it raises:
+
+            with db.transaction():
+                for row in rows:
+                    db.add_exhibit(*row)
+        """
+        conn = self._connect()
+        if conn.in_transaction:  # Nested: the outer block commits
+            yield self
+            return
+        conn.execute("BEGIN")
+        try:
+            yield self
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def _writing(self):
+        """Connection for a write: its own transaction, or the caller's open one"""
+        conn = self._connect()
+        if conn.in_transaction:  # Inside transaction(): its COMMIT covers this write
+            yield conn
+        else:
+            with conn:  # Commits on success, rolls back on error
+                yield conn
+
+    def _execute_write(self, query, params=()):
         """Execute write operations with proper transaction handling"""
-        with self._connect() as conn:
-            if params:
-                conn.execute(query, params)
-            else:
-                conn.execute(query)
-
-    def _execute_read(self, query, params=None):
+        with self._writing() as conn:
+            conn.execute(query, params)
+
+    def _insert_many(self, insert_sql, rows):
+        """
+        Insert rows in one transaction using multi-row VALUES lists of up to
+        INSERT_CHUNK_ROWS rows each; `insert_sql` ends with the VALUES keyword
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        row_placeholders = "(" + ", ".join("?" * len(rows[0])) + ")"
+        with self._writing() as conn:
+            for start in range(0, len(rows), INSERT_CHUNK_ROWS):
+                chunk = rows[start:start + INSERT_CHUNK_ROWS]
+                conn.execute(f"{insert_sql} {', '.join([row_placeholders] * len(chunk))}",
+                             [value for row in chunk for value in row])
+
+    def _update_many(self, update_sql, rows):
+        """
+        Apply (id, value) rows in one transaction; `update_sql` is an
+        UPDATE ... FROM upd, where upd(id, value) is filled from VALUES
+        lists of up to INSERT_CHUNK_ROWS rows each
+        """
+        rows = list(rows)
+        with self._writing() as conn:
+            for start in range(0, len(rows), INSERT_CHUNK_ROWS):
+                chunk = rows[start:start + INSERT_CHUNK_ROWS]
+                conn.execute(f"WITH upd(id, value) AS (VALUES {', '.join(['(?, ?)'] * len(chunk))}) {update_sql}",
+                             [value for row in chunk for value in row])
+
+    def _execute_read(self, query, params=()):
         """Execute read operations and return results"""
-        with self._connect() as conn:
-            if params:
-                result = conn.execute(query, params).fetchall()
-            else:
-                result = conn.execute(query).fetchall()
-        return result
+        return self._execute_read_iter(query, params).fetchall()
+
+    def _execute_read_iter(self, query, params=()):
+        """Execute a read and return the cursor, for callers that stream the rows once"""
+        return self._connect().execute(query, params)
 
     # Museum operations
     def add_museum(self, museum_name, city):
@@ -39,7 +185,7 @@ class MuseumDB:
 
     def list_museums(self):
         """Retrieve all museum records"""
-        return self._execute_read("SELECT * FROM museum ORDER BY id")
+        return self._execute_read("SELECT id, museum_name, city FROM museum ORDER BY id")
 
     def modify_museum(self, museum_id, new_name, new_city):
         """Update museum information"""
@@ -55,15 +201,27 @@ class MuseumDB:
     # Exhibit operations
     def add_exhibit(self, museum_id, title, category, acquisition_date):
         """Add new exhibit to museum"""
-        self._execute_write(
-            """INSERT INTO museum_item (museum_ref, item_title, item_type, date_acquired)
-               VALUES (?, ?, ?, ?)""",
-            (museum_id, title, category, acquisition_date)
+        self.add_exhibits([(museum_id, title, category, acquisition_date)])
+
+    def add_exhibits(self, exhibits):
+        """Add (museum_id, title, category, acquisition_date) exhibits in one transaction"""
+        self._insert_many(
+            "INSERT INTO museum_item (museum_ref, item_title, item_type, date_acquired) VALUES",
+            exhibits
         )
 
     def list_exhibits(self):
         """Get all exhibits"""
-        return self._execute_read("SELECT * FROM museum_item")
+        return self._execute_read(SQL_LIST_EXHIBITS)
+
+    def list_exhibits_stream(self, chunk_size=256):
+        """Yield all exhibits, fetching `chunk_size` rows at a time"""
+        cursor = self._execute_read_iter(SQL_LIST_EXHIBITS)
+        try:
+            while rows := cursor.fetchmany(chunk_size):
+                yield from rows
+        finally:
+            cursor.close()
 
     def rename_exhibit(self, exhibit_id, new_title):
         """Update exhibit title"""
@@ -72,6 +230,13 @@ class MuseumDB:
             (new_title, exhibit_id)
         )
 
+    def rename_exhibits(self, renames):
+        """Apply (exhibit_id, new_title) renames in one transaction"""
+        self._update_many(
+            "UPDATE museum_item SET item_title = upd.value FROM upd WHERE item_id = upd.id",
+            renames
+        )
+
     def remove_exhibit(self, exhibit_id):
         """Delete exhibit record"""
         self._execute_write("DELETE FROM museum_item WHERE item_id=?", (exhibit_id,))
@@ -79,15 +244,22 @@ class MuseumDB:
     # Maintenance operations
     def record_maintenance(self, exhibit_id, action, date, specialist):
         """Log conservation activity"""
-        self._execute_write(
+        self.record_maintenances([(exhibit_id, action, date, specialist)])
+
+    def record_maintenances(self, records):
+        """Log (exhibit_id, action, date, specialist) activities in one transaction"""
+        self._insert_many(
             """INSERT INTO item_maintenance (item_ref, maintenance_type, maintenance_date, specialist_name)
-               VALUES (?, ?, ?, ?)""",
-            (exhibit_id, action, date, specialist)
+               VALUES""",
+            records
         )
 
     def get_maintenance_log(self):
         """Retrieve all maintenance records"""
-        return self._execute_read("SELECT * FROM item_maintenance")
+        return self._execute_read(
+            """SELECT maintenance_id, item_ref, maintenance_type, maintenance_date, specialist_name
+               FROM item_maintenance"""
+        )
 
     def update_maintenance_action(self, maintenance_id, new_action):
         """Modify maintenance record"""
@@ -96,6 +268,13 @@ class MuseumDB:
             (new_action, maintenance_id)
         )
 
+    def update_maintenance_actions(self, updates):
+        """Apply (maintenance_id, new_action) changes in one transaction"""
+        self._update_many(
+            "UPDATE item_maintenance SET maintenance_type = upd.value FROM upd WHERE maintenance_id = upd.id",
+            updates
+        )
+
     def delete_maintenance_record(self, maintenance_id):
         """Remove maintenance entry"""
         self._execute_write("DELETE FROM item_maintenance WHERE maintenance_id=?", (maintenance_id,))
@@ -103,14 +282,18 @@ class MuseumDB:
     # Visitor operations
     def register_visitor(self, name, email):
         """Add visitor to database"""
-        self._execute_write(
-            "INSERT OR IGNORE INTO guest (guest_name, contact_email) VALUES (?, ?)",
-            (name, email)
+        self.register_visitors([(name, email)])
+
+    def register_visitors(self, visitors):
+        """Add (name, email) visitors in one transaction"""
+        self._insert_many(
+            "INSERT OR IGNORE INTO guest (guest_name, contact_email) VALUES",
+            visitors
         )
 
     def list_visitors(self):
         """Get all visitors"""
-        return self._execute_read("SELECT * FROM guest")
+        return self._execute_read("SELECT guest_id, guest_name, contact_email FROM guest")
 
     def update_visitor_email(self, visitor_id, new_email):
         """Change visitor email"""
@@ -119,6 +302,13 @@ class MuseumDB:
             (new_email, visitor_id)
         )
 
+    def update_visitor_emails(self, updates):
+        """Apply (visitor_id, new_email) changes in one transaction"""
+        self._update_many(
+            "UPDATE guest SET contact_email = upd.value FROM upd WHERE guest_id = upd.id",
+            updates
+        )
+
     def delete_visitor(self, visitor_id):
         """Remove visitor record"""
         self._execute_write("DELETE FROM guest WHERE guest_id=?", (visitor_id,))
@@ -126,14 +316,18 @@ class MuseumDB:
     # Visit operations
     def log_visit(self, visitor_id, museum_id, date):
         """Record museum visit"""
-        self._execute_write(
-            "INSERT INTO guest_visit (guest_ref, museum_ref, visit_date) VALUES (?, ?, ?)",
-            (visitor_id, museum_id, date)
+        self.log_visits([(visitor_id, museum_id, date)])
+
+    def log_visits(self, visits):
+        """Record (visitor_id, museum_id, date) visits in one transaction"""
+        self._insert_many(
+            "INSERT INTO guest_visit (guest_ref, museum_ref, visit_date) VALUES",
+            visits
         )
 
     def get_visit_records(self):
         """Retrieve all visits"""
-        return self._execute_read("SELECT * FROM guest_visit")
+        return self._execute_read("SELECT visit_id, guest_ref, museum_ref, visit_date FROM guest_visit")
 
     def change_visit_date(self, visit_id, new_date):
         """Update visit date"""
@@ -142,6 +336,13 @@ class MuseumDB:
             (new_date, visit_id)
         )
 
+    def change_visit_dates(self, changes):
+        """Apply (visit_id, new_date) changes in one transaction"""
+        self._update_many(
+            "UPDATE guest_visit SET visit_date = upd.value FROM upd WHERE visit_id = upd.id",
+            changes
+        )
+
     def remove_visit(self, visit_id):
         """Delete visit record"""
         self._execute_write("DELETE FROM guest_visit WHERE visit_id=?", (visit_id,))
@@ -149,108 +350,99 @@ class MuseumDB:
     # Analytical queries
     def get_exhibits_with_museum_info(self):
         """Join exhibits with museum details"""
-        return self._execute_read("""
-            SELECT mi.item_title, mi.item_type, m.museum_name
-            FROM museum_item mi
-            INNER JOIN museum m ON mi.museum_ref = m.id
-        """)
+        return self._execute_read(SQL_EXHIBITS_WITH_MUSEUM)
 
     def get_maintenance_history_sorted(self):
         """Maintenance records with exhibit info, sorted by date"""
-        return self._execute_read("""
-            SELECT mi.item_title, im.maintenance_type, im.maintenance_date, im.specialist_name
-            FROM item_maintenance im
-            JOIN museum_item mi ON im.item_ref = mi.item_id
-            ORDER BY im.maintenance_date DESC
-        """)
+        return self._execute_read(SQL_MAINTENANCE_HISTORY)
 
     def count_exhibits_by_museum(self):
         """Calculate exhibits per museum"""
-        return self._execute_read("""
-            SELECT m.museum_name, COUNT(mi.item_id) AS exhibit_count
-            FROM museum m
-            LEFT OUTER JOIN museum_item mi ON m.id = mi.museum_ref
-            GROUP BY m.id
-        """)
+        return self._execute_read(SQL_EXHIBITS_PER_MUSEUM)
 
     def count_visits_by_museum(self):
         """Calculate visit frequency per museum"""
-        return self._execute_read("""
-            SELECT m.museum_name, COUNT(gv.visit_id) AS visitor_count
-            FROM guest_visit gv
-            INNER JOIN museum m ON gv.museum_ref = m.id
-            GROUP BY m.id
-        """)
+        return self._execute_read(SQL_VISITS_PER_MUSEUM)
 
     def get_visitor_timeline(self):
         """Visitor history with museum visits"""
-        return self._execute_read("""
-            SELECT g.guest_name, m.museum_name, gv.visit_date
-            FROM guest_visit gv
-            INNER JOIN guest g ON gv.guest_ref = g.guest_id
-            INNER JOIN museum m ON gv.museum_ref = m.id
-            ORDER BY gv.visit_date
-        """)
-
+        return self._execute_read(SQL_VISITOR_TIMELINE)
+
+    def run_dashboard(self):
+        """
+        Yield (heading, rows) for every dashboard report inside one read
+        transaction (one consistent snapshot); rows stream from the cursor
+        and must be consumed before advancing to the next report. Inside
+        transaction() the reports join the caller's transaction, which the
+        caller still commits; otherwise writes made between reports join
+        this one and are committed or rolled back with it
+        """
+        conn = self._connect()
+        if conn.in_transaction:  # The open transaction already gives one snapshot
+            for title, query in DASHBOARD_REPORTS:
+                yield title, self._execute_read_iter(query)
+            return
+        conn.execute("BEGIN")
+        try:
+            for title, query in DASHBOARD_REPORTS:
+                yield title, self._execute_read_iter(query)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            if conn.in_transaction:  # Still the one opened above: not rolled back
+                conn.execute("COMMIT")
 
 def demonstrate_functionality():
     """Showcase database operations"""
-    db_manager = MuseumDB()
-
-    # Create sample data
-    db_manager.add_museum("National History Museum", "Karachi")
-
-    db_manager.add_exhibit(1, "Ancient Vase", "Archaeology", "2021-01-01")
-    db_manager.add_exhibit(1, "Medieval Sword", "Weapons", "2022-03-15")
-    db_manager.add_exhibit(1, "Historic Painting", "Art", "2023-05-10")
-
-    db_manager.register_visitor("Ali Khan", "ali@example.com")
-    db_manager.register_visitor("Sara Ahmed", "sara@example.com")
-    db_manager.register_visitor("Usman Raza", "usman@example.com")
-
-    db_manager.record_maintenance(1, "Cleaning", "2024-01-01", "Dr. Ahmed")
-    db_manager.record_maintenance(2, "Rust Removal", "2024-02-01", "Ms. Fatima")
-    db_manager.record_maintenance(3, "Frame Repair", "2024-03-01", "Mr. Hassan")
-
-    db_manager.log_visit(1, 1, "2024-04-01")
-    db_manager.log_visit(2, 1, "2024-04-02")
-    db_manager.log_visit(3, 1, "2024-04-03")
-
-    print("Registered Museums:", db_manager.list_museums())
-    print("Current Exhibits:", db_manager.list_exhibits())
-
-    # Update operations
-    db_manager.rename_exhibit(1, "Ancient Greek Vase")
-    db_manager.update_visitor_email(1, "ali.khan@example.com")
-
-    # Delete operations
-    db_manager.remove_visit(3)
-    db_manager.delete_maintenance_record(2)
-
-    print("Modified Exhibits:", db_manager.list_exhibits())
-    print("Remaining Visits:", db_manager.get_visit_records())
-
-    # Database Queries (GROUPING, JOINS, ORDER BY)
-    print("\n--- Exhibits with Museum Details ---")
-    for record in db_manager.get_exhibits_with_museum_info():
-        print(record)
-
-    print("\n--- Maintenance History (Recent First) ---")
-    for record in db_manager.get_maintenance_history_sorted():
-        print(record)
-
-    print("\n--- Exhibit Distribution ---")
-    for record in db_manager.count_exhibits_by_museum():
-        print(record)
-
-    print("\n--- Museum Popularity ---")
-    for record in db_manager.count_visits_by_museum():
-        print(record)
-
-    print("\n--- Visitor Timeline ---")
-    for record in db_manager.get_visitor_timeline():
-        print(record)
-
+    # Run against an in-memory copy: the demo's writes are throwaway, so skip the disk commits
+    with MuseumDB.in_memory_copy() as db_manager:
+        # Create sample data
+        db_manager.add_museum("National History Museum", "Karachi")
+
+        db_manager.add_exhibits([
+            (1, "Ancient Vase", "Archaeology", "2021-01-01"),
+            (1, "Medieval Sword", "Weapons", "2022-03-15"),
+            (1, "Historic Painting", "Art", "2023-05-10"),
+        ])
+
+        db_manager.register_visitors([
+            ("Ali Khan", "ali@example.com"),
+            ("Sara Ahmed", "sara@example.com"),
+            ("Usman Raza", "usman@example.com"),
+        ])
+
+        db_manager.record_maintenances([
+            (1, "Cleaning", "2024-01-01", "Dr. Ahmed"),
+            (2, "Rust Removal", "2024-02-01", "Ms. Fatima"),
+            (3, "Frame Repair", "2024-03-01", "Mr. Hassan"),
+        ])
+
+        db_manager.log_visits([
+            (1, 1, "2024-04-01"),
+            (2, 1, "2024-04-02"),
+            (3, 1, "2024-04-03"),
+        ])
+
+        print("Registered Museums:", [tuple(record) for record in db_manager.list_museums()])
+        print("Current Exhibits:")
+        sys.stdout.writelines(f"{tuple(record)}\n" for record in db_manager.list_exhibits_stream())
+
+        # Update and delete operations, committed together
+        with db_manager.transaction():
+            db_manager.rename_exhibit(1, "Ancient Greek Vase")
+            db_manager.update_visitor_email(1, "ali.khan@example.com")
+            db_manager.remove_visit(3)
+            db_manager.delete_maintenance_record(2)
+
+        print("Modified Exhibits:")
+        sys.stdout.writelines(f"{tuple(record)}\n" for record in db_manager.list_exhibits_stream())
+        print("Remaining Visits:", [tuple(record) for record in db_manager.get_visit_records()])
+
+        # Database Queries (GROUPING, JOINS, ORDER BY)
+        for title, records in db_manager.run_dashboard():
+            print(f"\n--- {title} ---")
+            sys.stdout.writelines(f"{tuple(record)}\n" for record in records)
 
 if __name__ == "__main__":
     demonstrate_functionality()
\ No newline at end of file
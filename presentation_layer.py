@@ -1,6 +1,51 @@
 from business_layer import *
 import sys
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
+
+# Table rows are built by padding each cell with str.ljust and joining with spaces
+
+def _menu(title: str, *options: str) -> str:
+    """Render a submenu block once, for printing with a single write"""
+    return f"\n--- {title} ---\n" + "".join(f"{option}\n" for option in options)
+
+# Static banners and menus, rendered once at import
+_RULE = "=" * 60
+_APP_BANNER = (f"{_RULE}\nHeritagePlus Museum Management System\n"
+               f"Multi-Tiered Architecture with Security & Analytics\n{_RULE}\n")
+_MAIN_MENU_ITEMS = (f"\n{_RULE}\nMAIN MENU\n{_RULE}\n"
+                    "1. Museum Management\n2. Exhibit Management\n3. Visitor Management\n"
+                    "4. Maintenance Management\n5. Analytics & Reports\n")
+_MAIN_MENU = _MAIN_MENU_ITEMS + "0. Exit\n"
+_ADMIN_MAIN_MENU = _MAIN_MENU_ITEMS + "6. User Management (Admin)\n0. Exit\n"
+_MUSEUM_MENU = _menu("MUSEUM MANAGEMENT", "1. View All Museums", "2. Add New Museum",
+                     "3. View Museum Performance", "0. Back")
+_EXHIBIT_MENU = _menu("EXHIBIT MANAGEMENT", "1. View All Exhibits", "2. Add New Exhibit",
+                      "3. Search Exhibits", "4. View Top Exhibits", "5. View High-Value Exhibits",
+                      "0. Back")
+_VISITOR_MENU = _menu("VISITOR MANAGEMENT", "1. View Visitor Activity", "2. Register New Visitor",
+                      "3. Log Visit", "4. View VIP Visitors", "0. Back")
+_MAINTENANCE_MENU = _menu("MAINTENANCE MANAGEMENT", "1. View Maintenance Summary",
+                          "2. Schedule Maintenance", "3. Generate Maintenance Plan",
+                          "4. View Maintenance Budget", "0. Back")
+_ANALYTICS_MENU = _menu("ANALYTICS & REPORTS", "1. Visitor Statistics",
+                        "2. Museum Performance Comparison", "0. Back")
+_USER_MANAGEMENT_MENU = _menu("USER MANAGEMENT (Admin Only)", "1. Create New User", "0. Back")
+
+def _input(prompt: str = "") -> str:
+    """input() at a terminal; a plain stdin readline for piped (scripted) sessions"""
+    if sys.stdin.isatty():
+        return input(prompt)
+    sys.stdout.write(prompt)  # No human is waiting on the prompt, so no flush
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError("EOF when reading a line")
+    return line.rstrip("\n")
+
+def write_lines(lines: List[str]):
+    """Write a block of output lines with one stdout write instead of a print per line"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 class MuseumApplication:
     """Main application controller with role-based interface"""
@@ -12,13 +57,11 @@ class MuseumApplication:
         self.exhibit_service = None
         self.visitor_service = None
         self.maintenance_service = None
+        self._menu_handlers = {}
 
     def run(self):
         """Main application loop"""
-        print("="*60)
-        print("HeritagePlus Museum Management System")
-        print("Multi-Tiered Architecture with Security & Analytics")
-        print("="*60)
+        sys.stdout.write(_APP_BANNER)
 
         # Authentication
         if not self.login():
@@ -32,10 +75,21 @@ class MuseumApplication:
         self.visitor_service = VisitorService(user_id)
         self.maintenance_service = MaintenanceService(user_id)
 
+        # Menu routing is fixed for the session: the user's role cannot change
+        self._menu_handlers = {
+            '1': self.museum_menu,
+            '2': self.exhibit_menu,
+            '3': self.visitor_menu,
+            '4': self.maintenance_menu,
+            '5': self.analytics_menu,
+        }
+        if self.current_user['role'] == 'admin':
+            self._menu_handlers['6'] = self.user_management_menu
+
         # Main menu loop
         while True:
             self.display_main_menu()
-            choice = input("\nEnter your choice: ").strip()
+            choice = _input("\nEnter your choice: ").strip()
 
             if choice == '0':
                 print("\nThank you for using HeritagePlus Museum System!")
@@ -50,8 +104,8 @@ class MuseumApplication:
         attempts = 0
 
         while attempts < max_attempts:
-            username = input("Username: ").strip()
-            password = input("Password: ").strip()
+            username = _input("Username: ").strip()
+            password = _input("Password: ").strip()
 
             try:
                 self.current_user = self.auth_service.login(username, password)
@@ -71,34 +125,12 @@ class MuseumApplication:
 
     def display_main_menu(self):
         """Display role-appropriate menu"""
-        print("\n" + "="*60)
-        print("MAIN MENU")
-        print("="*60)
-
-        print("1. Museum Management")
-        print("2. Exhibit Management")
-        print("3. Visitor Management")
-        print("4. Maintenance Management")
-        print("5. Analytics & Reports")
-
-        # Admin-only options
-        if self.current_user['role'] == 'admin':
-            print("6. User Management (Admin)")
-
-        print("0. Exit")
+        # Admins get the extra User Management option
+        sys.stdout.write(_ADMIN_MAIN_MENU if self.current_user['role'] == 'admin' else _MAIN_MENU)
 
     def handle_menu_choice(self, choice: str):
         """Route menu selection to appropriate handler"""
-        handlers = {
-            '1': self.museum_menu,
-            '2': self.exhibit_menu,
-            '3': self.visitor_menu,
-            '4': self.maintenance_menu,
-            '5': self.analytics_menu,
-            '6': self.user_management_menu if self.current_user['role'] == 'admin' else None
-        }
-
-        handler = handlers.get(choice)
+        handler = self._menu_handlers.get(choice)
         if handler:
             try:
                 handler()
@@ -109,13 +141,9 @@ class MuseumApplication:
 
     def museum_menu(self):
         """Museum management submenu"""
-        print("\n--- MUSEUM MANAGEMENT ---")
-        print("1. View All Museums")
-        print("2. Add New Museum")
-        print("3. View Museum Performance")
-        print("0. Back")
+        sys.stdout.write(_MUSEUM_MENU)
 
-        choice = input("Choice: ").strip()
+        choice = _input("Choice: ").strip()
 
         if choice == '1':
             self.view_museums()
@@ -129,23 +157,30 @@ class MuseumApplication:
         """Display all museums"""
         museums = self.museum_service.get_all_museums()
 
-        print(f"\n{'ID':<5} {'Name':<30} {'City':<15} {'Exhibits':<10}")
-        print("-" * 60)
+        lines = [f"\n{'ID':<5} {'Name':<30} {'City':<15} {'Exhibits':<10}", "-" * 60]
+        lines.extend(" ".join((str(museum['id']).ljust(5), museum['museum_name'].ljust(30),
+                               museum['city'].ljust(15), str(museum['exhibit_count']).ljust(10)))
+                     for museum in museums)
+        write_lines(lines)
 
-        for museum in museums:
-            print(f"{museum['id']:<5} {museum['museum_name']:<30} "
-                  f"{museum['city']:<15} {museum['exhibit_count']:<10}")
+    def read_museum_id(self, prompt: str) -> int:
+        """Read a museum ID, rendering the museum list first only if the user asks for it"""
+        answer = _input(f"{prompt} (or L to list museums): ").strip()
+        if answer.lower() == 'l':
+            self.view_museums()
+            answer = _input(f"{prompt}: ").strip()
+        return int(answer)
 
     def add_museum(self):
         """Add new museum with input validation"""
         print("\n--- ADD NEW MUSEUM ---")
 
         try:
-            name = input("Museum Name: ").strip()
-            city = input("City: ").strip()
-            address = input("Address (optional): ").strip()
-            phone = input("Phone (optional): ").strip()
-            hours = input("Opening Hours (optional): ").strip()
+            name = _input("Museum Name: ").strip()
+            city = _input("City: ").strip()
+            address = _input("Address (optional): ").strip()
+            phone = _input("Phone (optional): ").strip()
+            hours = _input("Opening Hours (optional): ").strip()
 
             museum_id = self.museum_service.create_museum(
                 name, city, address=address, phone=phone, opening_hours=hours
@@ -157,17 +192,15 @@ class MuseumApplication:
 
     def view_museum_performance(self):
         """Display museum performance metrics"""
-        self.view_museums()
-
         try:
-            museum_id = int(input("\nEnter Museum ID: "))
+            museum_id = self.read_museum_id("\nEnter Museum ID")
             performance = self.museum_service.get_museum_performance(museum_id)
 
             print(f"\n--- PERFORMANCE REPORT: {performance['museum_name']} ---")
             print(f"Total Exhibits: {performance.get('total_exhibits', 0)}")
             print(f"Total Visits: {performance.get('total_visits', 0)}")
-            print(f"Average Rating: {performance.get('avg_rating', 0):.2f}/5.0")
-            print(f"Total Revenue: ${performance.get('total_revenue', 0):.2f}")
+            print(f"Average Rating: {performance.get('avg_rating') or 0:.2f}/5.0")
+            print(f"Total Revenue: ${performance.get('total_revenue') or 0:.2f}")
             print(f"Performance Score: {performance['performance_score']:.2f}/100")
 
             print("\nRecommendations:")
@@ -179,15 +212,9 @@ class MuseumApplication:
 
     def exhibit_menu(self):
         """Exhibit management submenu"""
-        print("\n--- EXHIBIT MANAGEMENT ---")
-        print("1. View All Exhibits")
-        print("2. Add New Exhibit")
-        print("3. Search Exhibits")
-        print("4. View Top Exhibits")
-        print("5. View High-Value Exhibits")
-        print("0. Back")
+        sys.stdout.write(_EXHIBIT_MENU)
 
-        choice = input("Choice: ").strip()
+        choice = _input("Choice: ").strip()
 
         if choice == '1':
             self.view_exhibits()
@@ -203,34 +230,35 @@ class MuseumApplication:
 
     def view_exhibits(self):
         """Display all exhibits"""
-        exhibits = self.exhibit_service.repo.get_all_exhibits()
-
-        print(f"\n{'ID':<5} {'Title':<30} {'Museum':<25} {'Condition':<15}")
-        print("-" * 75)
+        page_size = 20  # Limit display
+        exhibits = self.exhibit_service.repo.get_exhibits_page(page_size)
 
-        for exhibit in exhibits[:20]:  # Limit display
-            print(f"{exhibit['item_id']:<5} {exhibit['item_title']:<30} "
-                  f"{exhibit['museum_name']:<25} {exhibit['condition']:<15}")
+        lines = [f"\n{'ID':<5} {'Title':<30} {'Museum':<25} {'Condition':<15}", "-" * 75]
+        lines.extend(" ".join((str(exhibit['item_id']).ljust(5), exhibit['item_title'].ljust(30),
+                               exhibit['museum_name'].ljust(25), (exhibit['condition'] or "-").ljust(15)))
+                     for exhibit in exhibits)
 
-        if len(exhibits) > 20:
-            print(f"\n... and {len(exhibits) - 20} more exhibits")
+        remaining = (self.exhibit_service.repo.count_exhibits() - page_size
+                     if len(exhibits) == page_size else 0)
+        if remaining:
+            lines.append(f"\n... and {remaining} more exhibits")
+        write_lines(lines)
 
     def add_exhibit(self):
         """Add new exhibit"""
         print("\n--- ADD NEW EXHIBIT ---")
 
         try:
-            self.view_museums()
-            museum_id = int(input("Museum ID: "))
-            title = input("Exhibit Title: ").strip()
-            category = input("Category: ").strip()
-            date = input("Acquisition Date (YYYY-MM-DD): ").strip()
-            description = input("Description (optional): ").strip()
+            museum_id = self.read_museum_id("Museum ID")
+            title = _input("Exhibit Title: ").strip()
+            category = _input("Category: ").strip()
+            date = _input("Acquisition Date (YYYY-MM-DD): ").strip()
+            description = _input("Description (optional): ").strip()
 
             print("\nCondition Options: Excellent, Good, Fair, Poor, Restoration Required")
-            condition = input("Condition: ").strip() or "Good"
+            condition = _input("Condition: ").strip() or "Good"
 
-            value_str = input("Estimated Value (optional): ").strip()
+            value_str = _input("Estimated Value (optional): ").strip()
             value = float(value_str) if value_str else 0.0
 
             exhibit_id = self.exhibit_service.add_exhibit(
@@ -244,7 +272,7 @@ class MuseumApplication:
 
     def search_exhibits(self):
         """Search exhibits by keyword"""
-        search_term = input("\nEnter search term: ").strip()
+        search_term = _input("\nEnter search term: ").strip()
 
         try:
             results = self.exhibit_service.search_exhibits(search_term)
@@ -267,43 +295,36 @@ class MuseumApplication:
         """Display exhibits with most maintenance"""
         top = self.exhibit_service.repo.top_exhibits()
 
-        print("\n--- TOP EXHIBITS (By Maintenance Frequency) ---")
-        print(f"{'Title':<30} {'Museum':<25} {'Maintenance Count':<20}")
-        print("-" * 75)
-
-        for exhibit in top:
-            print(f"{exhibit['item_title']:<30} {exhibit['museum_name']:<25} "
-                  f"{exhibit['maintenance_count']:<20}")
+        lines = ["\n--- TOP EXHIBITS (By Maintenance Frequency) ---",
+                 f"{'Title':<30} {'Museum':<25} {'Maintenance Count':<20}", "-" * 75]
+        lines.extend(" ".join((exhibit['item_title'].ljust(30), exhibit['museum_name'].ljust(25),
+                               str(exhibit['maintenance_count']).ljust(20)))
+                     for exhibit in top)
+        write_lines(lines)
 
     def view_valuable_exhibits(self):
         """Display high-value exhibits"""
         try:
-            min_value_str = input("\nMinimum value (default 5000): ").strip()
+            min_value_str = _input("\nMinimum value (default 5000): ").strip()
             min_value = float(min_value_str) if min_value_str else 5000.0
 
             valuable = self.exhibit_service.get_valuable_exhibits(min_value)
 
-            print(f"\n--- HIGH-VALUE EXHIBITS (>${min_value:.2f}) ---")
-            print(f"{'Title':<30} {'Museum':<25} {'Value':<15}")
-            print("-" * 70)
-
-            for exhibit in valuable:
-                print(f"{exhibit['item_title']:<30} {exhibit['museum_name']:<25} "
-                      f"${exhibit['value']:.2f}")
+            lines = [f"\n--- HIGH-VALUE EXHIBITS (>${min_value:.2f}) ---",
+                     f"{'Title':<30} {'Museum':<25} {'Value':<15}", "-" * 70]
+            lines.extend(" ".join((exhibit['item_title'].ljust(30), exhibit['museum_name'].ljust(25),
+                                   f"${exhibit['value']:.2f}"))
+                         for exhibit in valuable)
+            write_lines(lines)
 
         except ValueError as e:
             print(f"\n✗ {e}")
 
     def visitor_menu(self):
         """Visitor management submenu"""
-        print("\n--- VISITOR MANAGEMENT ---")
-        print("1. View Visitor Activity")
-        print("2. Register New Visitor")
-        print("3. Log Visit")
-        print("4. View VIP Visitors")
-        print("0. Back")
+        sys.stdout.write(_VISITOR_MENU)
 
-        choice = input("Choice: ").strip()
+        choice = _input("Choice: ").strip()
 
         if choice == '1':
             self.view_visitor_activity()
@@ -318,25 +339,23 @@ class MuseumApplication:
         """Display visitor statistics"""
         activity = self.visitor_service.repo.visitor_activity()
 
-        print(f"\n{'Name':<25} {'Email':<30} {'Visits':<10} {'Avg Rating':<12}")
-        print("-" * 77)
-
-        for visitor in activity[:15]:
-            avg_rating = visitor['avg_rating'] or 0
-            print(f"{visitor['guest_name']:<25} {visitor['contact_email']:<30} "
-                  f"{visitor['total_visits']:<10} {avg_rating:.2f}")
+        lines = [f"\n{'Name':<25} {'Email':<30} {'Visits':<10} {'Avg Rating':<12}", "-" * 77]
+        lines.extend(" ".join((visitor['guest_name'].ljust(25), visitor['contact_email'].ljust(30),
+                               str(visitor['total_visits']).ljust(10), f"{visitor['avg_rating'] or 0:.2f}"))
+                     for visitor in activity[:15])
+        write_lines(lines)
 
     def register_visitor(self):
         """Register new visitor"""
         print("\n--- REGISTER NEW VISITOR ---")
 
         try:
-            name = input("Full Name: ").strip()
-            email = input("Email: ").strip()
-            phone = input("Phone (optional): ").strip()
+            name = _input("Full Name: ").strip()
+            email = _input("Email: ").strip()
+            phone = _input("Phone (optional): ").strip()
 
             print("\nMembership Types: None, Basic, Premium, Family")
-            membership = input("Membership Type: ").strip() or "None"
+            membership = _input("Membership Type: ").strip() or "None"
 
             visitor_id = self.visitor_service.register_visitor(
                 name, email, phone=phone, membership=membership
@@ -351,25 +370,18 @@ class MuseumApplication:
         print("\n--- LOG MUSEUM VISIT ---")
 
         try:
-            visitor_id = int(input("Visitor ID: "))
+            visitor_id = int(_input("Visitor ID: "))
+            museum_id = self.read_museum_id("Museum ID")
 
-            self.view_museums()
-            museum_id = int(input("Museum ID: "))
-
-            date = input("Visit Date (YYYY-MM-DD, or press Enter for today): ").strip()
+            date = _input("Visit Date (YYYY-MM-DD, or press Enter for today): ").strip()
             if not date:
-                from datetime import datetime
-                date = datetime.now().strftime("%Y-%m-%d")
+                date = datetime.now().date().isoformat()
 
-            rating_str = input("Rating 1-5 (optional): ").strip()
+            rating_str = _input("Rating 1-5 (optional): ").strip()
             rating = int(rating_str) if rating_str else None
 
             # Get visitor's membership for pricing
-            visitor = self.visitor_service.repo.execute_read(
-                "SELECT membership_type FROM guest WHERE guest_id = ?",
-                (visitor_id,)
-            )
-            membership = visitor[0]['membership_type'] if visitor else "None"
+            membership = self.visitor_service.get_membership_type(visitor_id)
 
             visit_id = self.visitor_service.log_visit_with_pricing(
                 visitor_id, museum_id, date, membership, rating
@@ -382,32 +394,27 @@ class MuseumApplication:
     def view_vip_visitors(self):
         """Display VIP visitors"""
         try:
-            min_visits_str = input("\nMinimum visits for VIP status (default 5): ").strip()
+            min_visits_str = _input("\nMinimum visits for VIP status (default 5): ").strip()
             min_visits = int(min_visits_str) if min_visits_str else 5
 
             vip = self.visitor_service.identify_vip_visitors(min_visits)
 
-            print(f"\n--- VIP VISITORS ({min_visits}+ visits) ---")
-            print(f"{'Name':<25} {'Visits':<10} {'Total Spent':<15} {'Avg Rating':<12}")
-            print("-" * 62)
-
-            for visitor in vip:
-                print(f"{visitor['guest_name']:<25} {visitor['total_visits']:<10} "
-                      f"${visitor['total_spent']:.2f:<15} {visitor['avg_rating']:.2f}")
+            lines = [f"\n--- VIP VISITORS ({min_visits}+ visits) ---",
+                     f"{'Name':<25} {'Visits':<10} {'Total Spent':<15} {'Avg Rating':<12}", "-" * 62]
+            lines.extend(" ".join((visitor['guest_name'].ljust(25), str(visitor['total_visits']).ljust(10),
+                                   f"${visitor['total_spent'] or 0:.2f}".ljust(15),
+                                   f"{visitor['avg_rating'] or 0:.2f}"))
+                         for visitor in vip)
+            write_lines(lines)
 
         except ValueError as e:
             print(f"\n✗ {e}")
 
     def maintenance_menu(self):
         """Maintenance management submenu"""
-        print("\n--- MAINTENANCE MANAGEMENT ---")
-        print("1. View Maintenance Summary")
-        print("2. Schedule Maintenance")
-        print("3. Generate Maintenance Plan")
-        print("4. View Maintenance Budget")
-        print("0. Back")
+        sys.stdout.write(_MAINTENANCE_MENU)
 
-        choice = input("Choice: ").strip()
+        choice = _input("Choice: ").strip()
 
         if choice == '1':
             self.view_maintenance_summary()
@@ -423,28 +430,26 @@ class MuseumApplication:
         """Display maintenance summary"""
         summary = self.maintenance_service.repo.maintenance_summary()
 
-        print(f"\n{'Exhibit':<30} {'Museum':<25} {'Actions':<10} {'Total Cost':<12}")
-        print("-" * 77)
-
-        for item in summary:
-            cost = item['total_cost'] or 0
-            print(f"{item['item_title']:<30} {item['museum_name']:<25} "
-                  f"{item['total_actions']:<10} ${cost:.2f}")
+        lines = [f"\n{'Exhibit':<30} {'Museum':<25} {'Actions':<10} {'Total Cost':<12}", "-" * 77]
+        lines.extend(" ".join((item['item_title'].ljust(30), item['museum_name'].ljust(25),
+                               str(item['total_actions']).ljust(10), f"${item['total_cost'] or 0:.2f}"))
+                     for item in summary)
+        write_lines(lines)
 
     def schedule_maintenance(self):
         """Schedule maintenance action"""
         print("\n--- SCHEDULE MAINTENANCE ---")
 
         try:
-            item_id = int(input("Exhibit ID: "))
-            action = input("Maintenance Type: ").strip()
-            date = input("Date (YYYY-MM-DD): ").strip()
-            specialist = input("Specialist Name: ").strip()
+            item_id = int(_input("Exhibit ID: "))
+            action = _input("Maintenance Type: ").strip()
+            date = _input("Date (YYYY-MM-DD): ").strip()
+            specialist = _input("Specialist Name: ").strip()
 
-            cost_str = input("Estimated Cost (optional): ").strip()
+            cost_str = _input("Estimated Cost (optional): ").strip()
             cost = float(cost_str) if cost_str else 0.0
 
-            notes = input("Notes (optional): ").strip()
+            notes = _input("Notes (optional): ").strip()
 
             maintenance_id = self.maintenance_service.schedule_maintenance(
                 item_id, action, date, specialist, cost=cost, notes=notes
@@ -458,27 +463,26 @@ class MuseumApplication:
         """Generate prioritized maintenance plan"""
         print("\n--- MAINTENANCE PLAN ---")
 
-        plan = self.maintenance_service.generate_maintenance_plan()
+        plan = self.maintenance_service.generate_maintenance_plan(limit=15)
 
         if not plan:
             print("\n✓ All exhibits are up to date!")
             return
 
-        print(f"\n{'Exhibit':<30} {'Days Since':<12} {'Priority':<10} {'Urgency':<10}")
-        print("-" * 62)
-
-        for item in plan[:15]:
-            days = int(item['days_since']) if item['days_since'] else 999
-            print(f"{item['item_title']:<30} {days:<12} "
-                  f"{item['priority_score']:.1f:<10} {item['urgency']:<10}")
+        lines = [f"\n{'Exhibit':<30} {'Days Since':<12} {'Priority':<10} {'Urgency':<10}", "-" * 62]
+        lines.extend(" ".join((item['item_title'].ljust(30),
+                               str(int(item['days_since']) if item['days_since'] else 999).ljust(12),
+                               f"{item['priority_score']:.1f}".ljust(10), item['urgency'].ljust(10)))
+                     for item in plan)
+        write_lines(lines)
 
     def view_maintenance_budget(self):
         """View maintenance budget for date range"""
         print("\n--- MAINTENANCE BUDGET ---")
 
         try:
-            start_date = input("Start Date (YYYY-MM-DD): ").strip()
-            end_date = input("End Date (YYYY-MM-DD): ").strip()
+            start_date = _input("Start Date (YYYY-MM-DD): ").strip()
+            end_date = _input("End Date (YYYY-MM-DD): ").strip()
 
             budget = self.maintenance_service.get_maintenance_budget(start_date, end_date)
 
@@ -492,12 +496,9 @@ class MuseumApplication:
 
     def analytics_menu(self):
         """Analytics and reporting submenu"""
-        print("\n--- ANALYTICS & REPORTS ---")
-        print("1. Visitor Statistics")
-        print("2. Museum Performance Comparison")
-        print("0. Back")
+        sys.stdout.write(_ANALYTICS_MENU)
 
-        choice = input("Choice: ").strip()
+        choice = _input("Choice: ").strip()
 
         if choice == '1':
             self.visitor_statistics()
@@ -522,29 +523,24 @@ class MuseumApplication:
     def museum_comparison(self):
         """Compare performance across museums"""
         museums = self.museum_service.get_all_museums()
+        performance = self.museum_service.get_museum_performance_bulk([m['id'] for m in museums])
 
-        print("\n--- MUSEUM PERFORMANCE COMPARISON ---")
-        print(f"{'Museum':<30} {'Exhibits':<10} {'Score':<10}")
-        print("-" * 50)
-
-        for museum in museums:
-            try:
-                perf = self.museum_service.get_museum_performance(museum['id'])
-                print(f"{museum['museum_name']:<30} {museum['exhibit_count']:<10} "
-                      f"{perf['performance_score']:.1f}/100")
-            except:
-                pass
+        lines = ["\n--- MUSEUM PERFORMANCE COMPARISON ---",
+                 f"{'Museum':<30} {'Exhibits':<10} {'Score':<10}", "-" * 50]
+        # Museums removed since the (cached) museum list was read have no performance entry
+        lines.extend(" ".join((museum['museum_name'].ljust(30), str(museum['exhibit_count']).ljust(10),
+                               f"{performance[museum['id']]['performance_score']:.1f}/100"))
+                     for museum in museums if museum['id'] in performance)
+        write_lines(lines)
 
     def user_management_menu(self):
         """Admin-only user management"""
         if not self.check_permission('admin', show_error=False):
             return
 
-        print("\n--- USER MANAGEMENT (Admin Only) ---")
-        print("1. Create New User")
-        print("0. Back")
+        sys.stdout.write(_USER_MANAGEMENT_MENU)
 
-        choice = input("Choice: ").strip()
+        choice = _input("Choice: ").strip()
 
         if choice == '1':
             self.create_user()
@@ -554,11 +550,11 @@ class MuseumApplication:
         print("\n--- CREATE NEW USER ---")
 
         try:
-            username = input("Username: ").strip()
-            password = input("Password (min 8 chars): ").strip()
+            username = _input("Username: ").strip()
+            password = _input("Password (min 8 chars): ").strip()
 
             print("\nRoles: admin, curator, viewer")
-            role = input("Role: ").strip().lower()
+            role = _input("Role: ").strip().lower()
 
             user_id = self.auth_service.create_new_user(
                 username, password, role, self.current_user['role']